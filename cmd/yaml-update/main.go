@@ -3,10 +3,14 @@ package main
 
 import (
 	"context"
-	"crypto/sha256"
+	"errors"
 	"fmt"
+	"hash/fnv"
+	"io"
+	"io/fs"
 	"os"
 	"strings"
+	"sync"
 	"time"
 
 	"github.com/dnd-it/action-yaml-update/internal/github"
@@ -17,7 +21,11 @@ import (
 )
 
 func main() {
-	if err := run(); err != nil {
+	err := run()
+	if flushErr := outputs.Flush(); flushErr != nil {
+		outputs.LogWarning(fmt.Sprintf("Failed to write outputs: %v", flushErr))
+	}
+	if err != nil {
 		outputs.LogError(err.Error())
 		os.Exit(1)
 	}
@@ -38,71 +46,40 @@ func run() error {
 		outputs.LogInfo("Dry run mode enabled — no changes will be persisted")
 	}
 
-	// Process each file
+	// Process files concurrently, then report and write results in input order
+	results, err := processFiles(cfg)
+	if err != nil {
+		return err
+	}
+
 	var allChanges []updater.Change
 	var changedFiles []string
 	var allDiffs []string
 
-	for _, filePath := range cfg.Files {
-		if _, err := os.Stat(filePath); os.IsNotExist(err) {
-			return fmt.Errorf("file not found: %s", filePath)
-		}
+	for i, filePath := range cfg.Files {
+		res := results[i]
 
 		outputs.LogGroup(fmt.Sprintf("Processing %s", filePath))
 
-		originalContent, err := os.ReadFile(filePath)
-		if err != nil {
-			return fmt.Errorf("read file %s: %w", filePath, err)
-		}
-
-		doc, err := updater.LoadYAML(originalContent)
-		if err != nil {
-			return fmt.Errorf("parse yaml %s: %w", filePath, err)
-		}
-
-		if doc == nil || doc.Root == nil {
+		if res.skipped {
 			outputs.LogWarning(fmt.Sprintf("Skipping empty YAML file: %s", filePath))
 			outputs.LogEndGroup()
 			continue
 		}
 
-		var changes []updater.Change
-		switch cfg.Mode {
-		case "key":
-			changes, err = updater.UpdateKeys(doc, cfg.Keys, cfg.Values)
-			if err != nil {
-				outputs.LogEndGroup()
-				return fmt.Errorf("update failed for %s: %w", filePath, err)
-			}
-		case "image":
-			changes = updater.UpdateImageTags(doc, cfg.ImageName, cfg.ImageTag)
-		case "marker":
-			for i, marker := range cfg.Markers {
-				mc := updater.UpdateByMarker(doc, marker, cfg.MarkerValues[i])
-				changes = append(changes, mc...)
-			}
-		}
-
-		if len(changes) > 0 {
-			for _, c := range changes {
+		if len(res.changes) > 0 {
+			for _, c := range res.changes {
 				outputs.LogInfo(fmt.Sprintf("  %s: %v -> %v", c.Key, c.Old, c.New))
 			}
-			allChanges = append(allChanges, changes...)
+			allChanges = append(allChanges, res.changes...)
 			changedFiles = append(changedFiles, filePath)
 
-			newContent, err := updater.DumpYAML(doc)
-			if err != nil {
-				outputs.LogEndGroup()
-				return fmt.Errorf("dump yaml %s: %w", filePath, err)
-			}
-
-			fileDiff := updater.Diff(filePath, originalContent, newContent)
-			if fileDiff != "" {
-				allDiffs = append(allDiffs, fileDiff)
+			if res.diff != "" {
+				allDiffs = append(allDiffs, res.diff)
 			}
 
 			if !cfg.DryRun {
-				if err := os.WriteFile(filePath, newContent, 0644); err != nil {
+				if err := os.WriteFile(filePath, res.newContent, 0644); err != nil {
 					outputs.LogEndGroup()
 					return fmt.Errorf("write file %s: %w", filePath, err)
 				}
@@ -176,11 +153,21 @@ func run() error {
 		commitBranch = targetBranch
 	}
 
-	sha, err := gitops.CommitAndPush(changedFiles, cfg.CommitMessage, commitBranch)
+	sha, committed, err := gitops.CommitAndPush(changedFiles, cfg.CommitMessage, commitBranch)
 	if err != nil {
 		outputs.LogEndGroup()
 		return fmt.Errorf("commit and push: %w", err)
 	}
+	if !committed {
+		// The files already match HEAD, so no branch was pushed to open a PR
+		// from. changed still reports the YAML edits made in this run.
+		outputs.LogInfo("Nothing to commit: updated files already match HEAD; no commit or PR created (changed reflects the YAML edits only)")
+		outputs.LogEndGroup()
+		outputs.SetOutput("pr_number", "")
+		outputs.SetOutput("pr_url", "")
+		outputs.SetOutput("commit_sha", "")
+		return nil
+	}
 	outputs.SetOutput("commit_sha", sha)
 	outputs.LogInfo(fmt.Sprintf("Committed and pushed: %s", sha))
 	outputs.LogEndGroup()
@@ -191,20 +178,56 @@ func run() error {
 
 		prBody := cfg.PRBody
 		if prBody == "" {
-			var lines []string
-			for _, c := range allChanges {
-				lines = append(lines, fmt.Sprintf("- `%s`: `%v` → `%v`", c.Key, c.Old, c.New))
+			var b strings.Builder
+			b.WriteString("## Changes\n\n")
+			for i, c := range allChanges {
+				if i > 0 {
+					b.WriteByte('\n')
+				}
+				fmt.Fprintf(&b, "- `%s`: `%v` → `%v`", c.Key, c.Old, c.New)
 			}
-			prBody = "## Changes\n\n" + strings.Join(lines, "\n")
+			prBody = b.String()
 		}
 
-		// Check for an existing open PR for this branch
-		prData, err := github.FindPullRequest(ctx, cfg.GithubAPIURL, cfg.Token, owner, repo, commitBranch)
-		if err != nil {
-			outputs.LogWarning(fmt.Sprintf("Failed to check for existing PR: %v", err))
+		// Check for an existing open PR for this branch. Generated branch names
+		// are normally unique per run, so only an explicit pr_branch is looked up
+		// up front; a repeated generated name is handled when creation fails.
+		var prData *github.PRData
+		if cfg.PRBranch != "" {
+			prData, err = github.FindPullRequest(ctx, cfg.GithubAPIURL, cfg.Token, owner, repo, commitBranch)
+			if err != nil {
+				outputs.LogWarning(fmt.Sprintf("Failed to check for existing PR: %v", err))
+			}
+		}
+
+		created := false
+		if prData == nil {
+			// Create new PR
+			prData, err = github.CreatePullRequest(ctx, cfg.GithubAPIURL, cfg.Token, owner, repo, cfg.PRTitle, prBody, commitBranch, targetBranch)
+			switch {
+			case err == nil:
+				created = true
+			case errors.Is(err, github.ErrPullRequestExists):
+				// A generated branch name repeats when identical inputs run in the
+				// same second (a quick re-run, duplicated matrix legs); update the
+				// PR the earlier run opened instead.
+				prData, err = github.FindPullRequest(ctx, cfg.GithubAPIURL, cfg.Token, owner, repo, commitBranch)
+				if err == nil && prData == nil {
+					err = fmt.Errorf("no open pull request found for branch %s", commitBranch)
+				}
+				if err != nil {
+					outputs.LogEndGroup()
+					return fmt.Errorf("find existing pull request: %w", err)
+				}
+			default:
+				outputs.LogEndGroup()
+				return fmt.Errorf("create pull request: %w", err)
+			}
 		}
 
-		if prData != nil {
+		if created {
+			outputs.LogInfo(fmt.Sprintf("Created PR #%d: %s", prData.Number, prData.HTMLURL))
+		} else {
 			// Update existing PR
 			prData, err = github.UpdatePullRequest(ctx, cfg.GithubAPIURL, cfg.Token, owner, repo, prData.Number, cfg.PRTitle, prBody)
 			if err != nil {
@@ -212,40 +235,47 @@ func run() error {
 				return fmt.Errorf("update pull request: %w", err)
 			}
 			outputs.LogInfo(fmt.Sprintf("Updated PR #%d: %s", prData.Number, prData.HTMLURL))
-		} else {
-			// Create new PR
-			prData, err = github.CreatePullRequest(ctx, cfg.GithubAPIURL, cfg.Token, owner, repo, cfg.PRTitle, prBody, commitBranch, targetBranch)
-			if err != nil {
-				outputs.LogEndGroup()
-				return fmt.Errorf("create pull request: %w", err)
-			}
-			outputs.LogInfo(fmt.Sprintf("Created PR #%d: %s", prData.Number, prData.HTMLURL))
 		}
 
 		outputs.SetOutput("pr_number", fmt.Sprintf("%d", prData.Number))
 		outputs.SetOutput("pr_url", prData.HTMLURL)
 
+		// Labels, reviewers, and auto-merge are independent of each other, so
+		// they run concurrently; results are logged in a fixed order.
+		var tasks []prTask
 		if len(cfg.PRLabels) > 0 {
-			if err := github.AddLabels(ctx, cfg.GithubAPIURL, cfg.Token, owner, repo, prData.Number, cfg.PRLabels); err != nil {
-				outputs.LogWarning(fmt.Sprintf("Failed to add labels: %v", err))
-			} else {
-				outputs.LogInfo(fmt.Sprintf("Added labels: %s", strings.Join(cfg.PRLabels, ", ")))
-			}
+			tasks = append(tasks, prTask{
+				run: func() error {
+					return github.AddLabels(ctx, cfg.GithubAPIURL, cfg.Token, owner, repo, prData.Number, cfg.PRLabels)
+				},
+				success: fmt.Sprintf("Added labels: %s", strings.Join(cfg.PRLabels, ", ")),
+				failure: "Failed to add labels",
+			})
 		}
-
 		if len(cfg.PRReviewers) > 0 {
-			if err := github.RequestReviewers(ctx, cfg.GithubAPIURL, cfg.Token, owner, repo, prData.Number, cfg.PRReviewers); err != nil {
-				outputs.LogWarning(fmt.Sprintf("Failed to request reviewers: %v", err))
-			} else {
-				outputs.LogInfo(fmt.Sprintf("Requested reviewers: %s", strings.Join(cfg.PRReviewers, ", ")))
-			}
+			tasks = append(tasks, prTask{
+				run: func() error {
+					return github.RequestReviewers(ctx, cfg.GithubAPIURL, cfg.Token, owner, repo, prData.Number, cfg.PRReviewers)
+				},
+				success: fmt.Sprintf("Requested reviewers: %s", strings.Join(cfg.PRReviewers, ", ")),
+				failure: "Failed to request reviewers",
+			})
 		}
-
 		if cfg.AutoMerge && prData.NodeID != "" {
-			if err := github.EnableAutoMerge(ctx, cfg.GithubGraphQLURL, cfg.Token, prData.NodeID, cfg.MergeMethod); err != nil {
-				outputs.LogWarning(fmt.Sprintf("Failed to enable auto-merge: %v", err))
+			tasks = append(tasks, prTask{
+				run: func() error {
+					return github.EnableAutoMerge(ctx, cfg.GithubGraphQLURL, cfg.Token, prData.NodeID, cfg.MergeMethod)
+				},
+				success: fmt.Sprintf("Enabled auto-merge (%s)", cfg.MergeMethod),
+				failure: "Failed to enable auto-merge",
+			})
+		}
+
+		for i, err := range runPRTasks(tasks) {
+			if err != nil {
+				outputs.LogWarning(fmt.Sprintf("%s: %v", tasks[i].failure, err))
 			} else {
-				outputs.LogInfo(fmt.Sprintf("Enabled auto-merge (%s)", cfg.MergeMethod))
+				outputs.LogInfo(tasks[i].success)
 			}
 		}
 
@@ -259,8 +289,146 @@ func run() error {
 	return nil
 }
 
+// maxConcurrentWrites bounds concurrent mutating GitHub API requests, in line
+// with GitHub's guidance on avoiding secondary rate limits.
+const maxConcurrentWrites = 2
+
+// prTask is a follow-up API request made once the pull request exists.
+type prTask struct {
+	run     func() error
+	success string
+	failure string
+}
+
+// runPRTasks runs tasks concurrently, at most maxConcurrentWrites at a time,
+// and returns their errors in task order.
+func runPRTasks(tasks []prTask) []error {
+	errs := make([]error, len(tasks))
+
+	sem := make(chan struct{}, maxConcurrentWrites)
+	var wg sync.WaitGroup
+	for i, task := range tasks {
+		wg.Add(1)
+		go func(i int, task prTask) {
+			defer wg.Done()
+			sem <- struct{}{}
+			defer func() { <-sem }()
+			errs[i] = task.run()
+		}(i, task)
+	}
+	wg.Wait()
+
+	return errs
+}
+
+// maxConcurrentFiles bounds how many files are read and updated at once.
+const maxConcurrentFiles = 16
+
+// fileResult holds the outcome of updating a single file in memory.
+type fileResult struct {
+	changes    []updater.Change
+	newContent []byte
+	diff       string
+	skipped    bool
+}
+
+// processFiles runs processFile for every input file using a bounded pool of
+// goroutines. Results are returned in input order; if any file fails, the error
+// for the first failing file (in input order) is returned.
+func processFiles(cfg *inputs.Config) ([]*fileResult, error) {
+	results := make([]*fileResult, len(cfg.Files))
+	errs := make([]error, len(cfg.Files))
+
+	sem := make(chan struct{}, min(len(cfg.Files), maxConcurrentFiles))
+	var wg sync.WaitGroup
+	for i, filePath := range cfg.Files {
+		wg.Add(1)
+		go func(i int, filePath string) {
+			defer wg.Done()
+			sem <- struct{}{}
+			defer func() { <-sem }()
+			results[i], errs[i] = processFile(cfg, filePath)
+		}(i, filePath)
+	}
+	wg.Wait()
+
+	for _, err := range errs {
+		if err != nil {
+			return nil, err
+		}
+	}
+	return results, nil
+}
+
+// processFile reads, parses, and updates a single file without writing it back.
+func processFile(cfg *inputs.Config, filePath string) (*fileResult, error) {
+	originalContent, err := os.ReadFile(filePath)
+	if errors.Is(err, fs.ErrNotExist) {
+		return nil, fmt.Errorf("file not found: %s", filePath)
+	}
+	if err != nil {
+		return nil, fmt.Errorf("read file %s: %w", filePath, err)
+	}
+
+	// A zero-byte file has nothing to parse.
+	if len(originalContent) == 0 {
+		return &fileResult{skipped: true}, nil
+	}
+
+	doc, err := updater.LoadYAML(originalContent)
+	if err != nil {
+		return nil, fmt.Errorf("parse yaml %s: %w", filePath, err)
+	}
+
+	if doc.Empty() {
+		return &fileResult{skipped: true}, nil
+	}
+
+	var changes []updater.Change
+	switch cfg.Mode {
+	case "key":
+		changes, err = updater.UpdateKeys(doc, cfg.Keys, cfg.Values)
+		if err != nil {
+			return nil, fmt.Errorf("update failed for %s: %w", filePath, err)
+		}
+	case "image":
+		changes = updater.UpdateImageTags(doc, cfg.ImageName, cfg.ImageTag)
+	case "marker":
+		for i, marker := range cfg.Markers {
+			mc := updater.UpdateByMarker(doc, marker, cfg.MarkerValues[i])
+			changes = append(changes, mc...)
+		}
+	}
+
+	res := &fileResult{changes: changes}
+	if len(changes) == 0 {
+		return res, nil
+	}
+
+	res.newContent, err = updater.DumpYAML(doc)
+	if err != nil {
+		return nil, fmt.Errorf("dump yaml %s: %w", filePath, err)
+	}
+	// Dry runs always show the full text diff so formatting can be reviewed.
+	if cfg.DiffFormat == "structural" && !cfg.DryRun {
+		res.diff = updater.StructuralDiff(filePath, changes)
+	} else {
+		res.diff = updater.Diff(filePath, originalContent, res.newContent)
+	}
+
+	return res, nil
+}
+
 func generateBranchName(cfg *inputs.Config) string {
-	seed := fmt.Sprintf("%v%v%v%s%s", cfg.Files, cfg.Keys, cfg.Values, cfg.ImageName, cfg.ImageTag)
-	hash := sha256.Sum256([]byte(seed))
-	return fmt.Sprintf("yaml-update/%x-%d", hash[:4], time.Now().Unix())
+	// The hash only needs to tell runs apart, not resist attacks, so a 32-bit
+	// FNV-1a is enough and cheaper than a cryptographic digest. Inputs are fed
+	// in one at a time (NUL-separated) rather than formatted into a seed string.
+	h := fnv.New32a()
+	for _, group := range [][]string{cfg.Files, cfg.Keys, cfg.Values, {cfg.ImageName, cfg.ImageTag}} {
+		for _, v := range group {
+			_, _ = io.WriteString(h, v)
+			_, _ = h.Write([]byte{0})
+		}
+	}
+	return fmt.Sprintf("yaml-update/%08x-%d", h.Sum32(), time.Now().Unix())
 }
@@ -0,0 +1,95 @@
+package main
+
+import (
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+
+	"github.com/dnd-it/action-yaml-update/internal/inputs"
+)
+
+func TestProcessFilesResultsInInputOrder(t *testing.T) {
+	dir := t.TempDir()
+	var files []string
+	for i, content := range []string{
+		"app:\n  version: v1.0.0\n",
+		"app:\n  version: v2.0.0\n",
+		"",
+		"app:\n  version: v1.0.0\n",
+	} {
+		path := filepath.Join(dir, string(rune('a'+i))+".yaml")
+		writeFile(t, path, content)
+		files = append(files, path)
+	}
+
+	cfg := &inputs.Config{
+		Files:  files,
+		Mode:   "key",
+		Keys:   []string{"app.version"},
+		Values: []string{"v2.0.0"},
+	}
+	results, err := processFiles(cfg)
+	if err != nil {
+		t.Fatalf("processFiles failed: %v", err)
+	}
+	if len(results) != len(files) {
+		t.Fatalf("expected %d results, got %d", len(files), len(results))
+	}
+
+	wantChanges := []int{1, 0, 0, 1}
+	for i, res := range results {
+		if len(res.changes) != wantChanges[i] {
+			t.Errorf("%s: expected %d changes, got %d", files[i], wantChanges[i], len(res.changes))
+		}
+		if res.skipped != (i == 2) {
+			t.Errorf("%s: skipped = %v", files[i], res.skipped)
+		}
+		if wantChanges[i] > 0 && !strings.Contains(res.diff, files[i]) {
+			t.Errorf("%s: diff is for another file:\n%s", files[i], res.diff)
+		}
+	}
+}
+
+func TestProcessFilesFirstErrorInInputOrder(t *testing.T) {
+	dir := t.TempDir()
+	ok := filepath.Join(dir, "ok.yaml")
+	noKey := filepath.Join(dir, "nokey.yaml")
+	missing := filepath.Join(dir, "missing.yaml")
+	writeFile(t, ok, "app:\n  version: v1.0.0\n")
+	writeFile(t, noKey, "other: value\n")
+
+	tests := []struct {
+		name  string
+		files []string
+		want  string
+	}{
+		{"missing first", []string{ok, missing, noKey}, "file not found: " + missing},
+		{"update error first", []string{ok, noKey, missing}, "update failed for " + noKey},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			cfg := &inputs.Config{
+				Files:  tt.files,
+				Mode:   "key",
+				Keys:   []string{"app.version"},
+				Values: []string{"v2.0.0"},
+			}
+			_, err := processFiles(cfg)
+			if err == nil {
+				t.Fatal("expected error")
+			}
+			if !strings.HasPrefix(err.Error(), tt.want) {
+				t.Errorf("expected error starting with %q, got %q", tt.want, err)
+			}
+		})
+	}
+}
+
+func writeFile(t *testing.T, path, content string) {
+	t.Helper()
+	if err := os.WriteFile(path, []byte(content), 0644); err != nil {
+		t.Fatal(err)
+	}
+}
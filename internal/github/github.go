@@ -5,12 +5,14 @@ import (
 	"bytes"
 	"context"
 	"encoding/json"
+	"errors"
 	"fmt"
 	"io"
 	"math"
 	"net/http"
 	"strconv"
 	"strings"
+	"sync"
 	"time"
 
 	"github.com/google/go-github/v68/github"
@@ -149,6 +151,10 @@ func FindPullRequest(ctx context.Context, apiURL, token, owner, repo, head strin
 	}, nil
 }
 
+// ErrPullRequestExists is returned by CreatePullRequest when an open pull
+// request already exists for the head branch.
+var ErrPullRequestExists = errors.New("pull request already exists")
+
 // CreatePullRequest creates a new pull request.
 func CreatePullRequest(ctx context.Context, apiURL, token, owner, repo, title, body, head, base string) (*PRData, error) {
 	client, err := newClient(apiURL, token)
@@ -162,6 +168,9 @@ func CreatePullRequest(ctx context.Context, apiURL, token, owner, repo, title, b
 		Head:  &head,
 		Base:  &base,
 	})
+	if isPullRequestExists(err) {
+		return nil, fmt.Errorf("create pull request: %w: %w", ErrPullRequestExists, err)
+	}
 	if err != nil {
 		return nil, fmt.Errorf("create pull request: %w", err)
 	}
@@ -173,6 +182,21 @@ func CreatePullRequest(ctx context.Context, apiURL, token, owner, repo, title, b
 	}, nil
 }
 
+// isPullRequestExists reports whether err is GitHub's 422 validation error
+// for a head branch that already has an open pull request.
+func isPullRequestExists(err error) bool {
+	var errResp *github.ErrorResponse
+	if !errors.As(err, &errResp) || errResp.Response == nil || errResp.Response.StatusCode != http.StatusUnprocessableEntity {
+		return false
+	}
+	for _, e := range errResp.Errors {
+		if strings.Contains(e.Message, "already exists") {
+			return true
+		}
+	}
+	return false
+}
+
 // UpdatePullRequest updates the title and body of an existing pull request.
 func UpdatePullRequest(ctx context.Context, apiURL, token, owner, repo string, number int, title, body string) (*PRData, error) {
 	client, err := newClient(apiURL, token)
@@ -263,9 +287,6 @@ func EnableAutoMerge(ctx context.Context, graphqlURL, token, prNodeID, mergeMeth
 	req.Header.Set("Authorization", "bearer "+token)
 	req.Header.Set("Content-Type", "application/json")
 
-	httpClient := &http.Client{
-		Transport: &retryTransport{base: http.DefaultTransport},
-	}
 	resp, err := httpClient.Do(req)
 	if err != nil {
 		return fmt.Errorf("graphql request: %w", err)
@@ -300,10 +321,34 @@ func EnableAutoMerge(ctx context.Context, graphqlURL, token, prNodeID, mergeMeth
 	return nil
 }
 
+// httpClient is shared by every REST and GraphQL call so that requests reuse
+// pooled keep-alive connections instead of each paying a new TLS handshake.
+var httpClient = &http.Client{
+	Transport: &retryTransport{base: http.DefaultTransport},
+}
+
+type clientKey struct {
+	apiURL string
+	token  string
+}
+
+var (
+	clientsMu sync.Mutex
+	clients   = make(map[clientKey]*github.Client)
+)
+
+// newClient returns a GitHub client for the given API URL and token.
+// Clients are cached, so repeated calls during a run share one instance.
 func newClient(apiURL, token string) (*github.Client, error) {
-	httpClient := &http.Client{
-		Transport: &retryTransport{base: http.DefaultTransport},
+	key := clientKey{apiURL: apiURL, token: token}
+
+	clientsMu.Lock()
+	defer clientsMu.Unlock()
+
+	if client, ok := clients[key]; ok {
+		return client, nil
 	}
+
 	client := github.NewClient(httpClient).WithAuthToken(token)
 	if apiURL != "" && apiURL != "https://api.github.com" {
 		var err error
@@ -312,5 +357,7 @@ func newClient(apiURL, token string) (*github.Client, error) {
 			return nil, fmt.Errorf("configure enterprise GitHub client: %w", err)
 		}
 	}
+
+	clients[key] = client
 	return client, nil
 }
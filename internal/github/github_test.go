@@ -11,6 +11,8 @@ import (
 	"sync/atomic"
 	"testing"
 	"time"
+
+	"github.com/google/go-github/v68/github"
 )
 
 func TestNewClient_DefaultAPI(t *testing.T) {
@@ -53,6 +55,58 @@ func TestNewClient_InvalidEnterpriseURL(t *testing.T) {
 	}
 }
 
+func TestNewClient_Cached(t *testing.T) {
+	first, err := newClient("", "cache-token")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	second, err := newClient("", "cache-token")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if first != second {
+		t.Error("expected the same client for identical URL and token")
+	}
+
+	other, err := newClient("", "other-token")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if other == first {
+		t.Error("expected a different client for a different token")
+	}
+}
+
+func TestIsPullRequestExists(t *testing.T) {
+	validation := func(status int, msg string) error {
+		return fmt.Errorf("wrapped: %w", &github.ErrorResponse{
+			Response: &http.Response{StatusCode: status},
+			Message:  "Validation Failed",
+			Errors:   []github.Error{{Resource: "PullRequest", Code: "custom", Message: msg}},
+		})
+	}
+
+	tests := []struct {
+		name string
+		err  error
+		want bool
+	}{
+		{"already exists", validation(http.StatusUnprocessableEntity, "A pull request already exists for org:yaml-update/abc."), true},
+		{"other validation error", validation(http.StatusUnprocessableEntity, "No commits between main and yaml-update/abc"), false},
+		{"other status", validation(http.StatusForbidden, "A pull request already exists for org:yaml-update/abc."), false},
+		{"plain error", fmt.Errorf("network down"), false},
+		{"nil", nil, false},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := isPullRequestExists(tt.err); got != tt.want {
+				t.Errorf("isPullRequestExists() = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}
+
 func TestEnableAutoMerge_Success(t *testing.T) {
 	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
 		if r.Method != http.MethodPost {
@@ -2,10 +2,12 @@
 package gitops
 
 import (
+	"errors"
 	"fmt"
 	"os"
 	"os/exec"
 	"strings"
+	"sync"
 )
 
 // Configure sets up git with user info and authentication.
@@ -50,41 +52,91 @@ func GetDefaultBranch() string {
 // CreateBranch creates and checks out a new branch from a base.
 // It always starts fresh from origin/<base>, discarding any existing local branch.
 func CreateBranch(name, base string) error {
-	if err := run("git", "fetch", "origin", base); err != nil {
+	if err := run("git", fetchArgs(base)...); err != nil {
 		return err
 	}
 	// Delete local branch if it exists (ignore error if it doesn't)
-	_ = run("git", "branch", "-D", name)
+	_ = runQuiet("git", "branch", "-D", name)
 	return run("git", "checkout", "-b", name, "origin/"+base)
 }
 
 // CommitAndPush stages files, commits, and force-pushes to origin.
 // The branch always represents HEAD + the YAML changes, so force push is the default.
-func CommitAndPush(files []string, message, branch string) (string, error) {
-	for _, f := range files {
-		if err := run("git", "add", f); err != nil {
-			return "", err
-		}
+// committed is false when the staged files match HEAD; nothing is then
+// committed or pushed and sha is empty.
+func CommitAndPush(files []string, message, branch string) (sha string, committed bool, err error) {
+	// Stage everything in one invocation rather than spawning git per file.
+	if err := run("git", append([]string{"add", "-A", "--"}, files...)...); err != nil {
+		return "", false, err
+	}
+
+	staged, err := hasStagedChanges()
+	if err != nil {
+		return "", false, err
+	}
+	if !staged {
+		// Nothing differs from HEAD, so there is nothing to commit or push.
+		return "", false, nil
 	}
 
 	if err := run("git", "commit", "-m", message); err != nil {
-		return "", err
+		return "", false, err
 	}
 
 	// Fetch the remote branch so --force-with-lease has a valid reference.
 	// Ignore errors: the branch may not exist on the remote yet.
-	_ = run("git", "fetch", "origin", branch)
+	_ = runQuiet("git", fetchArgs(branch)...)
 
 	if err := run("git", "push", "--force-with-lease", "-u", "origin", branch); err != nil {
-		return "", fmt.Errorf("push failed: %w", err)
+		return "", false, fmt.Errorf("push failed: %w", err)
 	}
 
-	sha, err := output("git", "rev-parse", "HEAD")
+	out, err := output("git", "rev-parse", "HEAD")
 	if err != nil {
-		return "", err
+		return "", false, err
+	}
+
+	return strings.TrimSpace(out), true, nil
+}
+
+// fetchArgs returns the git fetch arguments for ref. Depth-1 clones, the
+// actions/checkout default, fetch only the tip commit instead of the ref's
+// whole history. Any other clone fetches normally: on a shallow repository
+// --depth also cuts the history already checked out, which would undo a
+// workflow's fetch-depth for every later step.
+func fetchArgs(ref string) []string {
+	if isDepthOne() {
+		return []string{"fetch", "--depth=1", "origin", ref}
 	}
+	return []string{"fetch", "origin", ref}
+}
+
+// isDepthOne reports whether the current repository is a shallow clone holding
+// only the HEAD commit. This cannot change during a run, so git is asked only
+// once.
+var isDepthOne = sync.OnceValue(detectDepthOne)
 
-	return strings.TrimSpace(sha), nil
+func detectDepthOne() bool {
+	out, err := output("git", "rev-parse", "--is-shallow-repository")
+	if err != nil || strings.TrimSpace(out) != "true" {
+		return false
+	}
+	out, err = output("git", "rev-list", "--count", "--max-count=2", "HEAD")
+	return err == nil && strings.TrimSpace(out) == "1"
+}
+
+// hasStagedChanges reports whether the index differs from HEAD.
+// git diff-index --quiet exits 1 when there are differences and 0 when there are none.
+func hasStagedChanges() (bool, error) {
+	err := runQuiet("git", "diff-index", "--cached", "--quiet", "HEAD")
+	if err == nil {
+		return false, nil
+	}
+	var exitErr *exec.ExitError
+	if errors.As(err, &exitErr) && exitErr.ExitCode() == 1 {
+		return true, nil
+	}
+	return false, fmt.Errorf("check staged changes: %w", err)
 }
 
 func run(name string, args ...string) error {
@@ -94,6 +146,13 @@ func run(name string, args ...string) error {
 	return cmd.Run()
 }
 
+// runQuiet runs a command whose failure is expected and ignored by the caller.
+// Its output is discarded rather than streamed, so it doesn't add misleading
+// "fatal:" lines to the job log.
+func runQuiet(name string, args ...string) error {
+	return exec.Command(name, args...).Run()
+}
+
 func output(name string, args ...string) (string, error) {
 	cmd := exec.Command(name, args...)
 	out, err := cmd.Output()
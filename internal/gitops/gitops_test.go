@@ -2,6 +2,10 @@ package gitops
 
 import (
 	"os"
+	"os/exec"
+	"path/filepath"
+	"strings"
+	"sync"
 	"testing"
 )
 
@@ -26,3 +30,185 @@ func TestGetDefaultBranch_FallsBack(t *testing.T) {
 		t.Fatal("expected non-empty branch name")
 	}
 }
+
+func TestCommitAndPush_StagesAllFiles(t *testing.T) {
+	chdirRepo(t)
+
+	for _, name := range []string{"a.yaml", "b.yaml"} {
+		if err := os.WriteFile(name, []byte("key: new\n"), 0644); err != nil {
+			t.Fatal(err)
+		}
+	}
+
+	sha, committed, err := CommitAndPush([]string{"a.yaml", "b.yaml"}, "update", "main")
+	if err != nil {
+		t.Fatalf("CommitAndPush failed: %v", err)
+	}
+	if !committed || sha == "" {
+		t.Fatalf("expected a new commit, got committed=%v sha=%q", committed, sha)
+	}
+
+	out, err := output("git", "show", "--name-only", "--format=", "HEAD")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if got := strings.Fields(out); len(got) != 2 || got[0] != "a.yaml" || got[1] != "b.yaml" {
+		t.Errorf("expected both files in commit, got %v", got)
+	}
+}
+
+func TestCommitAndPush_NoStagedChangesSkipsCommit(t *testing.T) {
+	chdirRepo(t)
+
+	head, err := output("git", "rev-parse", "HEAD")
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	// No file content differs from HEAD, so nothing should be committed.
+	sha, committed, err := CommitAndPush([]string{"."}, "update", "main")
+	if err != nil {
+		t.Fatalf("CommitAndPush failed: %v", err)
+	}
+	if committed || sha != "" {
+		t.Errorf("expected no commit, got committed=%v sha=%q", committed, sha)
+	}
+
+	after, err := output("git", "rev-parse", "HEAD")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if after != head {
+		t.Errorf("HEAD moved from %s to %s", strings.TrimSpace(head), strings.TrimSpace(after))
+	}
+}
+
+func TestRunQuiet_ReturnsErrorWithoutOutput(t *testing.T) {
+	chdirRepo(t)
+
+	if err := runQuiet("git", "branch", "-D", "does-not-exist"); err == nil {
+		t.Fatal("expected error deleting a missing branch")
+	}
+	if err := runQuiet("git", "rev-parse", "HEAD"); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+}
+
+func TestFetchArgs_FullClone(t *testing.T) {
+	chdirRepo(t)
+
+	got := strings.Join(fetchArgs("main"), " ")
+	if got != "fetch origin main" {
+		t.Errorf("unexpected fetch args for full clone: %q", got)
+	}
+}
+
+func TestFetchArgs_ShallowClone(t *testing.T) {
+	chdirRepo(t)
+	remote, err := filepath.Abs(filepath.Join("..", "remote.git"))
+	if err != nil {
+		t.Fatal(err)
+	}
+	shallow := filepath.Join(t.TempDir(), "shallow")
+	if out, err := exec.Command("git", "clone", "--depth=1", "file://"+remote, shallow).CombinedOutput(); err != nil {
+		t.Fatalf("git clone: %v\n%s", err, out)
+	}
+	if err := os.Chdir(shallow); err != nil {
+		t.Fatal(err)
+	}
+	resetShallow(t)
+
+	got := strings.Join(fetchArgs("main"), " ")
+	if got != "fetch --depth=1 origin main" {
+		t.Errorf("unexpected fetch args for shallow clone: %q", got)
+	}
+	if err := run("git", fetchArgs("main")...); err != nil {
+		t.Fatalf("shallow fetch failed: %v", err)
+	}
+}
+
+func TestCreateBranch_KeepsDeeperShallowHistory(t *testing.T) {
+	chdirRepo(t)
+	for i := 0; i < 4; i++ {
+		if err := runQuiet("git", "commit", "--allow-empty", "-m", "more"); err != nil {
+			t.Fatal(err)
+		}
+	}
+	if err := runQuiet("git", "push", "origin", "main"); err != nil {
+		t.Fatal(err)
+	}
+
+	remote, err := filepath.Abs(filepath.Join("..", "remote.git"))
+	if err != nil {
+		t.Fatal(err)
+	}
+	shallow := filepath.Join(t.TempDir(), "shallow")
+	if out, err := exec.Command("git", "clone", "--depth=3", "file://"+remote, shallow).CombinedOutput(); err != nil {
+		t.Fatalf("git clone: %v\n%s", err, out)
+	}
+	if err := os.Chdir(shallow); err != nil {
+		t.Fatal(err)
+	}
+	resetShallow(t)
+
+	if got := strings.Join(fetchArgs("main"), " "); got != "fetch origin main" {
+		t.Errorf("unexpected fetch args for depth-3 clone: %q", got)
+	}
+	if err := CreateBranch("yaml-update/test", "main"); err != nil {
+		t.Fatalf("CreateBranch failed: %v", err)
+	}
+
+	out, err := output("git", "rev-list", "--count", "HEAD")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if got := strings.TrimSpace(out); got != "3" {
+		t.Errorf("expected history depth 3 after CreateBranch, got %s", got)
+	}
+}
+
+// chdirRepo creates a work repo with a bare origin in a temp dir and changes into it.
+func chdirRepo(t *testing.T) {
+	t.Helper()
+	if _, err := exec.LookPath("git"); err != nil {
+		t.Skip("git not available")
+	}
+
+	dir := t.TempDir()
+	remote := filepath.Join(dir, "remote.git")
+	work := filepath.Join(dir, "work")
+
+	cwd, err := os.Getwd()
+	if err != nil {
+		t.Fatal(err)
+	}
+	t.Cleanup(func() { _ = os.Chdir(cwd) })
+
+	steps := [][]string{
+		{"init", "--bare", "-b", "main", remote},
+		{"init", "-b", "main", work},
+		{"-C", work, "config", "user.name", "test"},
+		{"-C", work, "config", "user.email", "test@example.com"},
+		{"-C", work, "remote", "add", "origin", remote},
+		{"-C", work, "commit", "--allow-empty", "-m", "init"},
+		{"-C", work, "push", "-u", "origin", "main"},
+	}
+	for _, args := range steps {
+		if out, err := exec.Command("git", args...).CombinedOutput(); err != nil {
+			t.Fatalf("git %v: %v\n%s", args, err, out)
+		}
+	}
+
+	if err := os.Chdir(work); err != nil {
+		t.Fatal(err)
+	}
+	resetShallow(t)
+}
+
+// resetShallow clears the cached depth-1 clone check after a test changes
+// repository, and again when the test ends.
+func resetShallow(t *testing.T) {
+	t.Helper()
+	isDepthOne = sync.OnceValue(detectDepthOne)
+	t.Cleanup(func() { isDepthOne = sync.OnceValue(detectDepthOne) })
+}
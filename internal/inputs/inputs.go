@@ -35,6 +35,7 @@ type Config struct {
 	AutoMerge      bool
 	MergeMethod    string
 	DryRun         bool
+	DiffFormat     string
 	GitUserName    string
 	GitUserEmail   string
 	GithubRepo     string
@@ -57,6 +58,7 @@ func Parse() (*Config, error) {
 		AutoMerge:      parseBool(getEnv("AUTO_MERGE", "false")),
 		MergeMethod:    getEnv("MERGE_METHOD", "SQUASH"),
 		DryRun:         parseBool(getEnv("DRY_RUN", "false")),
+		DiffFormat:     getEnv("DIFF_FORMAT", "unified"),
 		GitUserName:    getEnv("GIT_USER_NAME", "github-actions[bot]"),
 		GitUserEmail:   getEnv("GIT_USER_EMAIL", "41898282+github-actions[bot]@users.noreply.github.com"),
 		GithubRepo:     os.Getenv("GITHUB_REPOSITORY"),
@@ -66,7 +68,9 @@ func Parse() (*Config, error) {
 	}
 
 	// Parse files
-	cfg.Files = parseList(getEnv("FILES", ""), "\n")
+	// Files are processed concurrently, so a path listed twice would be
+	// updated twice from the same original content; keep the first only.
+	cfg.Files = mergeFiles(parseList(getEnv("FILES", ""), "\n"), nil)
 	cfg.FilesFrom = getEnv("FILES_FROM", "")
 	cfg.FilesFilter = getEnv("FILES_FILTER", "")
 
@@ -87,6 +91,10 @@ func Parse() (*Config, error) {
 		return nil, fmt.Errorf("invalid mode '%s'. Must be 'key', 'image', or 'marker'", cfg.Mode)
 	}
 
+	if cfg.DiffFormat != "unified" && cfg.DiffFormat != "structural" {
+		return nil, fmt.Errorf("invalid diff_format '%s'. Must be 'unified' or 'structural'", cfg.DiffFormat)
+	}
+
 	// Parse shared value input
 	cfg.Value = getEnv("VALUE", "")
 
@@ -185,20 +193,22 @@ func getEnvDefault(name, defaultValue string) string {
 }
 
 func parseBool(s string) bool {
-	lower := strings.ToLower(strings.TrimSpace(s))
-	return lower == "true" || lower == "yes" || lower == "1"
+	switch strings.ToLower(strings.TrimSpace(s)) {
+	case "true", "yes", "1", "on":
+		return true
+	}
+	return false
 }
 
+// parseList splits s on sep, trimming items and dropping empty ones.
 func parseList(s, sep string) []string {
-	if strings.TrimSpace(s) == "" {
-		return nil
-	}
 	var result []string
-	for _, item := range strings.Split(s, sep) {
-		item = strings.TrimSpace(item)
-		if item != "" {
+	for s != "" {
+		item, rest, _ := strings.Cut(s, sep)
+		if item = strings.TrimSpace(item); item != "" {
 			result = append(result, item)
 		}
+		s = rest
 	}
 	return result
 }
@@ -241,19 +251,18 @@ func discoverFiles(dir, filter string) ([]string, error) {
 }
 
 // mergeFiles combines two file lists, removing duplicates while preserving order.
+// Paths are compared after filepath.Clean, so "./a.yaml" and "a.yaml" are one file;
+// the first spelling seen is kept.
 func mergeFiles(a, b []string) []string {
 	seen := make(map[string]bool, len(a)+len(b))
 	var result []string
-	for _, f := range a {
-		if !seen[f] {
-			seen[f] = true
-			result = append(result, f)
-		}
-	}
-	for _, f := range b {
-		if !seen[f] {
-			seen[f] = true
-			result = append(result, f)
+	for _, list := range [][]string{a, b} {
+		for _, f := range list {
+			key := filepath.Clean(f)
+			if !seen[key] {
+				seen[key] = true
+				result = append(result, f)
+			}
 		}
 	}
 	return result
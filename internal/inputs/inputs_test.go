@@ -132,6 +132,52 @@ func TestParseFilesAndFilesFromDedup(t *testing.T) {
 	}
 }
 
+func TestParseFilesDedup(t *testing.T) {
+	dir := t.TempDir()
+	a := filepath.Join(dir, "a.yaml")
+	b := filepath.Join(dir, "b.yaml")
+	mkFile(t, a)
+	mkFile(t, b)
+
+	// Duplicate explicit paths without files_from
+	setEnv(t, "FILES", a+"\n"+b+"\n"+a)
+	setEnv(t, "MODE", "key")
+	setEnv(t, "KEYS", "app.version")
+	setEnv(t, "VALUES", "1.0.0")
+
+	cfg, err := Parse()
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+
+	if len(cfg.Files) != 2 || cfg.Files[0] != a || cfg.Files[1] != b {
+		t.Fatalf("expected [%s %s], got %v", a, b, cfg.Files)
+	}
+}
+
+func TestParseFilesAndFilesFromDedupUncleanPath(t *testing.T) {
+	dir := t.TempDir()
+	f := filepath.Join(dir, "values.yaml")
+	mkFile(t, f)
+
+	// Explicit path spelled with "./"; discovery yields the cleaned path
+	explicit := dir + "/./values.yaml"
+	setEnv(t, "FILES", explicit)
+	setEnv(t, "FILES_FROM", dir)
+	setEnv(t, "MODE", "key")
+	setEnv(t, "KEYS", "app.version")
+	setEnv(t, "VALUES", "1.0.0")
+
+	cfg, err := Parse()
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+
+	if len(cfg.Files) != 1 || cfg.Files[0] != explicit {
+		t.Fatalf("expected [%s] (deduped), got %v", explicit, cfg.Files)
+	}
+}
+
 func TestParseFilesFromNonExistentDir(t *testing.T) {
 	setEnv(t, "FILES_FROM", "/nonexistent/path")
 	setEnv(t, "MODE", "key")
@@ -356,6 +402,99 @@ func TestParseMarkerModeCountMismatch(t *testing.T) {
 	}
 }
 
+func TestParseDiffFormat(t *testing.T) {
+	dir := t.TempDir()
+	f := filepath.Join(dir, "values.yaml")
+	mkFile(t, f)
+
+	setEnv(t, "FILES", f)
+	setEnv(t, "KEYS", "app.version")
+	setEnv(t, "VALUES", "1.0.0")
+
+	cfg, err := Parse()
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if cfg.DiffFormat != "unified" {
+		t.Errorf("expected default diff format unified, got %q", cfg.DiffFormat)
+	}
+
+	setEnv(t, "DIFF_FORMAT", "structural")
+	cfg, err = Parse()
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if cfg.DiffFormat != "structural" {
+		t.Errorf("expected diff format structural, got %q", cfg.DiffFormat)
+	}
+
+	setEnv(t, "DIFF_FORMAT", "side-by-side")
+	if _, err := Parse(); err == nil {
+		t.Fatal("expected error for invalid diff_format")
+	}
+}
+
+func TestParseBool(t *testing.T) {
+	tests := []struct {
+		in   string
+		want bool
+	}{
+		{"true", true},
+		{"True", true},
+		{" yes ", true},
+		{"1", true},
+		{"on", true},
+		{"false", false},
+		{"no", false},
+		{"0", false},
+		{"off", false},
+		{"", false},
+		{"maybe", false},
+	}
+	for _, tt := range tests {
+		if got := parseBool(tt.in); got != tt.want {
+			t.Errorf("parseBool(%q) = %v, want %v", tt.in, got, tt.want)
+		}
+	}
+}
+
+func TestParseList(t *testing.T) {
+	tests := []struct {
+		in   string
+		sep  string
+		want []string
+	}{
+		{"", "\n", nil},
+		{"  \n ", "\n", nil},
+		{"a.yaml\nb.yaml\n", "\n", []string{"a.yaml", "b.yaml"}},
+		{"a.yaml\n\n  b.yaml  ", "\n", []string{"a.yaml", "b.yaml"}},
+		{"bug, ,deps,", ",", []string{"bug", "deps"}},
+	}
+	for _, tt := range tests {
+		got := parseList(tt.in, tt.sep)
+		if len(got) != len(tt.want) {
+			t.Errorf("parseList(%q) = %q, want %q", tt.in, got, tt.want)
+			continue
+		}
+		for i := range got {
+			if got[i] != tt.want[i] {
+				t.Errorf("parseList(%q) = %q, want %q", tt.in, got, tt.want)
+				break
+			}
+		}
+	}
+}
+
+func TestGetEnvNormalizesName(t *testing.T) {
+	setEnv(t, "PR_BRANCH", "feature")
+
+	for _, name := range []string{"PR_BRANCH", "pr_branch", "pr-branch"} {
+		if got := getEnv(name, ""); got != "feature" {
+			t.Errorf("getEnv(%q) = %q, want %q", name, got, "feature")
+		}
+	}
+}
+
 // mkFile creates a file with parent directories and minimal YAML content.
 func mkFile(t *testing.T, path string) {
 	t.Helper()
@@ -4,30 +4,87 @@ package outputs
 import (
 	"fmt"
 	"os"
+	"strconv"
 	"strings"
+	"sync"
 	"time"
 )
 
-// SetOutput writes a value to GITHUB_OUTPUT.
+// output is a name/value pair waiting to be written to GITHUB_OUTPUT.
+type output struct {
+	name  string
+	value string
+}
+
+var (
+	pendingMu sync.Mutex
+	pending   []output
+)
+
+// SetOutput records a value for GITHUB_OUTPUT. Values are buffered and written
+// by Flush in one open/write/close, instead of reopening the file per output.
+// Without GITHUB_OUTPUT, the legacy set-output command is printed immediately.
 func SetOutput(name, value string) {
-	outputFile := os.Getenv("GITHUB_OUTPUT")
-	if outputFile != "" {
-		f, err := os.OpenFile(outputFile, os.O_APPEND|os.O_WRONLY|os.O_CREATE, 0644)
-		if err != nil {
-			fmt.Printf("::set-output name=%s::%s\n", name, value)
-			return
+	if os.Getenv("GITHUB_OUTPUT") == "" {
+		fmt.Printf("::set-output name=%s::%s\n", name, value)
+		return
+	}
+
+	pendingMu.Lock()
+	defer pendingMu.Unlock()
+	pending = append(pending, output{name: name, value: value})
+}
+
+// Flush writes all buffered outputs to GITHUB_OUTPUT and clears the buffer,
+// so calling it more than once never writes an output twice. If the file
+// cannot be opened, the outputs are printed as set-output commands instead.
+func Flush() error {
+	pendingMu.Lock()
+	defer pendingMu.Unlock()
+
+	if len(pending) == 0 {
+		return nil
+	}
+	outs := pending
+	pending = nil
+
+	f, err := os.OpenFile(os.Getenv("GITHUB_OUTPUT"), os.O_APPEND|os.O_WRONLY|os.O_CREATE, 0644)
+	if err != nil {
+		for _, o := range outs {
+			fmt.Printf("::set-output name=%s::%s\n", o.name, o.value)
 		}
-		defer func() { _ = f.Close() }()
+		return nil
+	}
 
-		if strings.Contains(value, "\n") {
-			delimiter := fmt.Sprintf("ghadelimiter_%d", time.Now().UnixNano())
-			_, _ = fmt.Fprintf(f, "%s<<%s\n%s\n%s\n", name, delimiter, value, delimiter)
+	// One delimiter serves every multiline value in this write: each block
+	// ends at the first line equal to it.
+	var delimiter string
+	var buf strings.Builder
+	for _, o := range outs {
+		buf.WriteString(o.name)
+		if strings.Contains(o.value, "\n") {
+			if delimiter == "" {
+				delimiter = "ghadelimiter_" + strconv.FormatInt(time.Now().UnixNano(), 10)
+			}
+			buf.WriteString("<<")
+			buf.WriteString(delimiter)
+			buf.WriteString("\n")
+			buf.WriteString(o.value)
+			buf.WriteString("\n")
+			buf.WriteString(delimiter)
+			buf.WriteString("\n")
 		} else {
-			_, _ = fmt.Fprintf(f, "%s=%s\n", name, value)
+			buf.WriteString("=")
+			buf.WriteString(o.value)
+			buf.WriteString("\n")
 		}
-	} else {
-		fmt.Printf("::set-output name=%s::%s\n", name, value)
 	}
+
+	if _, err := f.WriteString(buf.String()); err != nil {
+		_ = f.Close()
+		return fmt.Errorf("write outputs: %w", err)
+	}
+	return f.Close()
 }
 
 // LogInfo prints an info message.
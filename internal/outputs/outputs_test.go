@@ -0,0 +1,122 @@
+package outputs
+
+import (
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+)
+
+func TestSetOutputBuffersUntilFlush(t *testing.T) {
+	path := githubOutput(t)
+
+	SetOutput("changed", "true")
+	SetOutput("changed_files", "a.yaml\nb.yaml")
+
+	if _, err := os.Stat(path); !os.IsNotExist(err) {
+		t.Fatalf("expected no output file before Flush, stat err: %v", err)
+	}
+
+	if err := Flush(); err != nil {
+		t.Fatalf("Flush failed: %v", err)
+	}
+
+	got := readOutputs(t, path)
+	if len(got) != 2 || got["changed"] != "true" || got["changed_files"] != "a.yaml\nb.yaml" {
+		t.Errorf("unexpected outputs: %q", got)
+	}
+
+	data, err := os.ReadFile(path)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if !strings.HasPrefix(string(data), "changed=true\nchanged_files<<ghadelimiter_") {
+		t.Errorf("expected outputs in order with a ghadelimiter_ block, got:\n%s", data)
+	}
+}
+
+func TestFlushMultipleMultilineValues(t *testing.T) {
+	path := githubOutput(t)
+
+	SetOutput("changed_files", "a.yaml\nb.yaml")
+	SetOutput("pr_url", "")
+	SetOutput("diff", "--- a.yaml\n+++ a.yaml")
+	if err := Flush(); err != nil {
+		t.Fatal(err)
+	}
+
+	got := readOutputs(t, path)
+	want := map[string]string{
+		"changed_files": "a.yaml\nb.yaml",
+		"pr_url":        "",
+		"diff":          "--- a.yaml\n+++ a.yaml",
+	}
+	if len(got) != len(want) {
+		t.Fatalf("got %d outputs, want %d: %q", len(got), len(want), got)
+	}
+	for name, value := range want {
+		if got[name] != value {
+			t.Errorf("output %s = %q, want %q", name, got[name], value)
+		}
+	}
+}
+
+func TestFlushTwiceDoesNotDuplicate(t *testing.T) {
+	path := githubOutput(t)
+
+	SetOutput("pr_number", "42")
+	if err := Flush(); err != nil {
+		t.Fatal(err)
+	}
+	if err := Flush(); err != nil {
+		t.Fatal(err)
+	}
+
+	data, err := os.ReadFile(path)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if got := string(data); got != "pr_number=42\n" {
+		t.Errorf("unexpected output file content: %q", got)
+	}
+}
+
+// githubOutput points GITHUB_OUTPUT at a path in a fresh temp dir. The file is
+// not created up front: Flush opens it with O_CREATE.
+func githubOutput(t *testing.T) string {
+	t.Helper()
+	path := filepath.Join(t.TempDir(), "github_output")
+	t.Setenv("GITHUB_OUTPUT", path)
+	return path
+}
+
+// readOutputs parses a GITHUB_OUTPUT file, including name<<delimiter blocks.
+func readOutputs(t *testing.T, path string) map[string]string {
+	t.Helper()
+	data, err := os.ReadFile(path)
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	outs := make(map[string]string)
+	lines := strings.Split(strings.TrimSuffix(string(data), "\n"), "\n")
+	for i := 0; i < len(lines); i++ {
+		if name, delimiter, ok := strings.Cut(lines[i], "<<"); ok {
+			var value []string
+			for i++; i < len(lines) && lines[i] != delimiter; i++ {
+				value = append(value, lines[i])
+			}
+			if i == len(lines) {
+				t.Fatalf("unterminated output %q in:\n%s", name, data)
+			}
+			outs[name] = strings.Join(value, "\n")
+			continue
+		}
+		name, value, ok := strings.Cut(lines[i], "=")
+		if !ok {
+			t.Fatalf("malformed output line %q", lines[i])
+		}
+		outs[name] = value
+	}
+	return outs
+}
@@ -2,7 +2,9 @@
 package updater
 
 import (
+	"bytes"
 	"fmt"
+	"slices"
 	"sort"
 	"strconv"
 	"strings"
@@ -28,7 +30,9 @@ type Change struct {
 
 // Document wraps a yaml.Node with detected indentation.
 type Document struct {
-	Root     *yaml.Node
+	Root *yaml.Node
+	// Indent is the indentation used when re-encoding. Zero means it is
+	// detected from the original content on first use.
 	Indent   int
 	original []byte      // stored for targeted edits
 	edits    []valueEdit // tracked during updates
@@ -41,15 +45,23 @@ func LoadYAML(content []byte) (*Document, error) {
 		return nil, fmt.Errorf("parse yaml: %w", err)
 	}
 
-	indent := detectIndent(content)
-
+	// Indentation only matters when the document is re-encoded, which targeted
+	// edits avoid, so detection is deferred to DumpYAML.
 	return &Document{
 		Root:     &node,
-		Indent:   indent,
 		original: content,
 	}, nil
 }
 
+// Empty reports whether the document has no content, as for a file that is
+// blank or holds only comments.
+func (d *Document) Empty() bool {
+	if d.Root == nil || d.Root.Kind == 0 {
+		return true
+	}
+	return d.Root.Kind == yaml.DocumentNode && len(d.Root.Content) == 0
+}
+
 // DumpYAML serializes a Document back to bytes, preserving formatting.
 // When edits were tracked during updates, it applies targeted replacements
 // to the original content to preserve blank lines and other formatting.
@@ -58,7 +70,11 @@ func DumpYAML(doc *Document) ([]byte, error) {
 		return applyEdits(doc.original, doc.edits), nil
 	}
 
-	var buf strings.Builder
+	if doc.Indent == 0 {
+		doc.Indent = detectIndent(doc.original)
+	}
+
+	var buf bytes.Buffer
 	enc := yaml.NewEncoder(&buf)
 	enc.SetIndent(doc.Indent)
 
@@ -66,41 +82,71 @@ func DumpYAML(doc *Document) ([]byte, error) {
 		return nil, err
 	}
 
-	return []byte(buf.String()), nil
+	return buf.Bytes(), nil
 }
 
 // applyEdits performs targeted text replacements at exact positions in the original content.
+// Edits are applied in a single forward pass that copies the untouched spans of
+// original into one output buffer, so the file is never split into lines.
 func applyEdits(original []byte, edits []valueEdit) []byte {
-	lines := strings.SplitAfter(string(original), "\n")
-
-	// Sort edits in reverse order so earlier positions stay valid after replacement.
+	// Sort by position; the stable sort keeps repeated edits of the same
+	// scalar in the order they were made.
 	sorted := make([]valueEdit, len(edits))
 	copy(sorted, edits)
-	sort.Slice(sorted, func(i, j int) bool {
+	sort.SliceStable(sorted, func(i, j int) bool {
 		if sorted[i].Line != sorted[j].Line {
-			return sorted[i].Line > sorted[j].Line
+			return sorted[i].Line < sorted[j].Line
 		}
-		return sorted[i].Column > sorted[j].Column
+		return sorted[i].Column < sorted[j].Column
 	})
 
-	for _, edit := range sorted {
-		lineIdx := edit.Line - 1
-		if lineIdx < 0 || lineIdx >= len(lines) {
+	out := make([]byte, 0, len(original)+64)
+	copied := 0 // original[:copied] has already been written to out
+	line, lineStart := 1, 0
+
+	for k := 0; k < len(sorted); k++ {
+		edit := sorted[k]
+
+		// A scalar updated more than once keeps only its final value.
+		for k+1 < len(sorted) && sorted[k+1].Line == edit.Line && sorted[k+1].Column == edit.Column {
+			k++
+			if sorted[k].OldValue == edit.NewValue {
+				edit.NewValue = sorted[k].NewValue
+			}
+		}
+
+		for line < edit.Line && lineStart < len(original) {
+			if i := bytes.IndexByte(original[lineStart:], '\n'); i >= 0 {
+				lineStart += i + 1
+			} else {
+				lineStart = len(original)
+			}
+			line++
+		}
+		if edit.Line < 1 || edit.Column < 1 || line != edit.Line {
 			continue
 		}
 
-		line := lines[lineIdx]
-		colIdx := edit.Column - 1
+		lineEnd := len(original)
+		if i := bytes.IndexByte(original[lineStart:], '\n'); i >= 0 {
+			lineEnd = lineStart + i + 1
+		}
 
 		oldRepr := formatScalar(edit.OldValue, edit.Style)
 		newRepr := formatScalar(edit.NewValue, edit.Style)
 
-		if colIdx < len(line) && colIdx+len(oldRepr) <= len(line) && line[colIdx:colIdx+len(oldRepr)] == oldRepr {
-			lines[lineIdx] = line[:colIdx] + newRepr + line[colIdx+len(oldRepr):]
+		start := lineStart + edit.Column - 1
+		end := start + len(oldRepr)
+		if start < copied || start >= lineEnd || end > lineEnd || string(original[start:end]) != oldRepr {
+			continue
 		}
+
+		out = append(out, original[copied:start]...)
+		out = append(out, newRepr...)
+		copied = end
 	}
 
-	return []byte(strings.Join(lines, ""))
+	return append(out, original[copied:]...)
 }
 
 func formatScalar(value string, style yaml.Style) string {
@@ -114,15 +160,23 @@ func formatScalar(value string, style yaml.Style) string {
 	}
 }
 
+// detectIndent returns the indentation of the first indented content line.
+// It scans the raw bytes line by line and stops at the first match, so only
+// the head of the file is read and no per-line strings are allocated.
 func detectIndent(content []byte) int {
-	lines := strings.Split(string(content), "\n")
-	for _, line := range lines {
-		stripped := strings.TrimLeft(line, " \t")
-		if stripped == "" || strings.HasPrefix(stripped, "#") {
+	for len(content) > 0 {
+		line := content
+		if i := bytes.IndexByte(content, '\n'); i >= 0 {
+			line, content = content[:i], content[i+1:]
+		} else {
+			content = nil
+		}
+
+		stripped := bytes.TrimLeft(line, " \t")
+		if len(stripped) == 0 || stripped[0] == '#' {
 			continue
 		}
-		indent := len(line) - len(stripped)
-		if indent > 0 {
+		if indent := len(line) - len(stripped); indent > 0 {
 			return indent
 		}
 	}
@@ -139,44 +193,42 @@ func UpdateKeys(doc *Document, keys, values []string) ([]Change, error) {
 		content = doc.Root.Content[0]
 	}
 
+	resolver := newKeyResolver(content, len(keys) > 1)
 	for i, keyPath := range keys {
 		newValue := values[i]
 
-		node, err := resolveKeyPath(content, keyPath)
+		node, err := resolver.resolve(keyPath)
 		if err != nil {
 			return nil, err
 		}
 
-		oldValue := nodeValue(node)
-		coerced := coerceValue(newValue, node)
-
-		if node.Value != coerced {
-			doc.edits = append(doc.edits, valueEdit{
-				Line:     node.Line,
-				Column:   node.Column,
-				OldValue: node.Value,
-				NewValue: coerced,
-				Style:    node.Style,
-			})
-			changes = append(changes, Change{
-				Key: keyPath,
-				Old: oldValue,
-				New: parseValue(coerced),
-			})
-			node.Value = coerced
-			// Preserve the original tag/style when possible
-			if node.Tag == "!!int" || node.Tag == "!!float" || node.Tag == "!!bool" {
-				// Keep the tag if coerced value matches the type
-				if _, err := strconv.Atoi(coerced); err == nil && node.Tag == "!!int" {
-					// Keep !!int
-				} else if _, err := strconv.ParseFloat(coerced, 64); err == nil && node.Tag == "!!float" {
-					// Keep !!float
-				} else if coerced == "true" || coerced == "false" {
-					// Keep !!bool
-				} else {
-					node.Tag = "!!str"
-				}
-			}
+		coerced, typed := coerceValue(newValue, node)
+		if node.Value == coerced {
+			continue
+		}
+
+		// Size both lists once for the remaining keys on the first change,
+		// rather than growing them key by key on bulk updates.
+		if changes == nil {
+			changes = make([]Change, 0, len(keys)-i)
+			doc.edits = slices.Grow(doc.edits, len(keys)-i)
+		}
+		doc.edits = append(doc.edits, valueEdit{
+			Line:     node.Line,
+			Column:   node.Column,
+			OldValue: node.Value,
+			NewValue: coerced,
+			Style:    node.Style,
+		})
+		changes = append(changes, Change{
+			Key: keyPath,
+			Old: nodeValue(node),
+			New: parseValue(coerced),
+		})
+		node.Value = coerced
+		// A value that doesn't fit the original type is now a string
+		if !typed {
+			node.Tag = "!!str"
 		}
 	}
 
@@ -185,6 +237,23 @@ func UpdateKeys(doc *Document, keys, values []string) ([]Change, error) {
 
 // UpdateImageTags searches for image references and updates their tags.
 func UpdateImageTags(doc *Document, imageName, newTag string) []Change {
+	return UpdateImageTagsBatch(doc, map[string]string{imageName: newTag})
+}
+
+// UpdateImageTagsBatch updates the tags of several images in a single walk of
+// the document. tags maps image name to new tag; a repository (or Kustomize
+// name) matches an image when it equals the name or ends with "/"+name.
+func UpdateImageTagsBatch(doc *Document, tags map[string]string) []Change {
+	// A name that appears nowhere in the source text cannot match, so skip the
+	// walk when no name does. Escape sequences could spell a name differently
+	// from the parsed value, so sources containing a backslash are always walked.
+	if len(doc.original) > 0 && bytes.IndexByte(doc.original, '\\') < 0 {
+		tags = imagesInSource(doc.original, tags)
+		if len(tags) == 0 {
+			return nil
+		}
+	}
+
 	var changes []Change
 
 	content := doc.Root
@@ -192,10 +261,32 @@ func UpdateImageTags(doc *Document, imageName, newTag string) []Change {
 		content = doc.Root.Content[0]
 	}
 
-	walkImageTags(doc, content, imageName, newTag, &changes, "")
+	walkImageTags(doc, content, tags, &changes)
 	return changes
 }
 
+// imagesInSource returns the entries of tags whose image name occurs in src,
+// reusing tags itself when every name does.
+func imagesInSource(src []byte, tags map[string]string) map[string]string {
+	missing := 0
+	for name := range tags {
+		if !bytes.Contains(src, []byte(name)) {
+			missing++
+		}
+	}
+	if missing == 0 {
+		return tags
+	}
+
+	present := make(map[string]string, len(tags)-missing)
+	for name, tag := range tags {
+		if bytes.Contains(src, []byte(name)) {
+			present[name] = tag
+		}
+	}
+	return present
+}
+
 // UpdateByMarker searches for scalar nodes with an inline comment matching the marker
 // and updates their values. The marker can be a bare marker (e.g. "x-yaml-update")
 // or the comment may contain additional text after the marker.
@@ -207,186 +298,320 @@ func UpdateByMarker(doc *Document, marker, newValue string) []Change {
 		content = doc.Root.Content[0]
 	}
 
-	walkMarker(doc, content, marker, newValue, &changes, "")
+	walkMarker(doc, content, marker, marker+":", newValue, &changes)
 	return changes
 }
 
-func walkMarker(doc *Document, node *yaml.Node, marker, newValue string, changes *[]Change, path string) {
-	switch node.Kind {
-	case yaml.MappingNode:
-		for i := 0; i < len(node.Content); i += 2 {
-			keyNode := node.Content[i]
-			valNode := node.Content[i+1]
-			childPath := keyNode.Value
-			if path != "" {
-				childPath = path + "." + keyNode.Value
+// walkMarker updates scalars whose line comment carries marker, visiting the
+// tree depth-first with an explicit stack. prefix is marker+":", built once by
+// the caller rather than per node.
+func walkMarker(doc *Document, root *yaml.Node, marker, prefix, newValue string, changes *[]Change) {
+	stack := []nodeFrame{{node: root}}
+	for len(stack) > 0 {
+		frame := stack[len(stack)-1]
+		stack = stack[:len(stack)-1]
+		node := frame.node
+
+		switch node.Kind {
+		case yaml.ScalarNode:
+			// Only marked mapping values are pushed as scalars; frame.path
+			// ends in their own key. A bare scalar document has no path.
+			if frame.path == nil {
+				continue
 			}
-
-			if valNode.Kind == yaml.ScalarNode && hasMarker(valNode.LineComment, marker) {
-				oldValue := nodeValue(valNode)
-				coerced := coerceValue(newValue, valNode)
-
-				if valNode.Value != coerced {
-					doc.edits = append(doc.edits, valueEdit{
-						Line:     valNode.Line,
-						Column:   valNode.Column,
-						OldValue: valNode.Value,
-						NewValue: coerced,
-						Style:    valNode.Style,
-					})
-					*changes = append(*changes, Change{
-						Key: childPath,
-						Old: oldValue,
-						New: parseValue(coerced),
-					})
-					valNode.Value = coerced
+			setScalar(doc, node, newValue, frame.path.parent, frame.path.key, changes)
+		case yaml.MappingNode:
+			// Push in reverse so entries are popped, and changes reported, in
+			// document order.
+			for i := len(node.Content) - 2; i >= 0; i -= 2 {
+				valNode := node.Content[i+1]
+				if valNode.Kind == yaml.ScalarNode && !matchMarker(valNode.LineComment, marker, prefix) {
+					continue
 				}
-			} else {
-				walkMarker(doc, valNode, marker, newValue, changes, childPath)
+				stack = append(stack, nodeFrame{
+					node: valNode,
+					path: &pathSegment{parent: frame.path, key: node.Content[i].Value},
+				})
 			}
-		}
-	case yaml.SequenceNode:
-		for i, child := range node.Content {
-			childPath := fmt.Sprintf("%s.%d", path, i)
-			if path == "" {
-				childPath = strconv.Itoa(i)
+		case yaml.SequenceNode:
+			for i := len(node.Content) - 1; i >= 0; i-- {
+				child := node.Content[i]
+				if child.Kind == yaml.MappingNode || child.Kind == yaml.SequenceNode {
+					stack = append(stack, nodeFrame{
+						node: child,
+						path: &pathSegment{parent: frame.path, key: strconv.Itoa(i)},
+					})
+				}
 			}
-			walkMarker(doc, child, marker, newValue, changes, childPath)
 		}
 	}
 }
 
-// hasMarker checks whether a comment string contains the given marker.
-// Supports both "# x-yaml-update" and "# x-yaml-update:some-id" formats.
-func hasMarker(comment, marker string) bool {
+// matchMarker checks whether a comment string contains the given marker.
+// Supports both "# x-yaml-update" and "# x-yaml-update:some-id" formats;
+// prefix is marker+":", built once by the caller.
+func matchMarker(comment, marker, prefix string) bool {
+	if comment == "" {
+		return false
+	}
 	comment = strings.TrimSpace(comment)
 	comment = strings.TrimPrefix(comment, "#")
 	comment = strings.TrimSpace(comment)
-	return comment == marker || strings.HasPrefix(comment, marker+":")
+	return comment == marker || strings.HasPrefix(comment, prefix)
 }
 
-func resolveKeyPath(node *yaml.Node, keyPath string) (*yaml.Node, error) {
-	parts := strings.Split(keyPath, ".")
-	current := node
+// keyResolver resolves dot-notation key paths within one document. Every
+// intermediate node it reaches is cached by its path prefix, so keys sharing a
+// prefix (app.image.tag, app.image.repository) walk that prefix only once.
+// A resolver built without caching (the single-key case) keeps nil maps and
+// just walks the path.
+type keyResolver struct {
+	root     *yaml.Node
+	prefixes map[string]*yaml.Node
+
+	// Mappings searched more than once get a key -> value index, so many keys
+	// under one wide mapping don't each rescan all of its entries.
+	searched map[*yaml.Node]bool
+	indexes  map[*yaml.Node]map[string]*yaml.Node
+}
 
-	for i, part := range parts {
-		if current.Kind == yaml.MappingNode {
-			found := false
-			for j := 0; j < len(current.Content); j += 2 {
-				if current.Content[j].Value == part {
-					current = current.Content[j+1]
-					found = true
-					break
-				}
-			}
-			if !found {
-				return nil, fmt.Errorf("key '%s' not found in path '%s'", part, keyPath)
-			}
-		} else if current.Kind == yaml.SequenceNode {
-			idx, err := strconv.Atoi(part)
-			if err != nil {
-				return nil, fmt.Errorf("expected integer index for list, got '%s' in path '%s'", part, keyPath)
-			}
-			if idx < 0 || idx >= len(current.Content) {
-				return nil, fmt.Errorf("index %d out of range in path '%s'", idx, keyPath)
-			}
-			current = current.Content[idx]
-		} else if i < len(parts)-1 {
-			return nil, fmt.Errorf("cannot traverse into scalar at '%s' in path '%s'", part, keyPath)
+func newKeyResolver(root *yaml.Node, cache bool) *keyResolver {
+	if !cache {
+		return &keyResolver{root: root}
+	}
+	return &keyResolver{
+		root:     root,
+		prefixes: make(map[string]*yaml.Node),
+		searched: make(map[*yaml.Node]bool),
+		indexes:  make(map[*yaml.Node]map[string]*yaml.Node),
+	}
+}
+
+// resolve returns the node at keyPath, starting from the longest cached prefix.
+func (r *keyResolver) resolve(keyPath string) (*yaml.Node, error) {
+	current, pos := r.root, 0
+	for end := strings.LastIndexByte(keyPath, '.'); end >= 0; end = strings.LastIndexByte(keyPath[:end], '.') {
+		if node, ok := r.prefixes[keyPath[:end]]; ok {
+			current, pos = node, end+1
+			break
 		}
 	}
 
-	return current, nil
+	for {
+		part, last := keyPath[pos:], true
+		end := strings.IndexByte(part, '.')
+		if end >= 0 {
+			part, last = part[:end], false
+		}
+
+		next, err := r.step(current, part, keyPath, last)
+		if err != nil {
+			return nil, err
+		}
+		if last {
+			return next, nil
+		}
+
+		pos += end + 1
+		if r.prefixes != nil {
+			r.prefixes[keyPath[:pos-1]] = next
+		}
+		current = next
+	}
 }
 
-func walkImageTags(doc *Document, node *yaml.Node, imageName, newTag string, changes *[]Change, path string) {
-	switch node.Kind {
+// step descends from current into the child named by part.
+func (r *keyResolver) step(current *yaml.Node, part, keyPath string, last bool) (*yaml.Node, error) {
+	switch current.Kind {
 	case yaml.MappingNode:
-		// Build a map of key -> value node for easy lookup
-		keyMap := make(map[string]*yaml.Node)
-		for i := 0; i < len(node.Content); i += 2 {
-			key := node.Content[i].Value
-			keyMap[key] = node.Content[i+1]
-		}
-
-		// Check for repository/tag pattern (Helm-style)
-		if repoNode, ok := keyMap["repository"]; ok {
-			if tagNode, ok := keyMap["tag"]; ok {
-				repoVal := repoNode.Value
-				if strings.HasSuffix(repoVal, "/"+imageName) || repoVal == imageName {
-					oldTag := nodeValue(tagNode)
-					coerced := coerceValue(newTag, tagNode)
-					if tagNode.Value != coerced {
-						doc.edits = append(doc.edits, valueEdit{
-							Line:     tagNode.Line,
-							Column:   tagNode.Column,
-							OldValue: tagNode.Value,
-							NewValue: coerced,
-							Style:    tagNode.Style,
-						})
-						tagPath := "tag"
-						if path != "" {
-							tagPath = path + ".tag"
-						}
-						*changes = append(*changes, Change{
-							Key: tagPath,
-							Old: oldTag,
-							New: parseValue(coerced),
-						})
-						tagNode.Value = coerced
-					}
-				}
+		if child, ok := r.lookup(current, part); ok {
+			return child, nil
+		}
+		return nil, fmt.Errorf("key '%s' not found in path '%s'", part, keyPath)
+	case yaml.SequenceNode:
+		idx, err := strconv.Atoi(part)
+		if err != nil {
+			return nil, fmt.Errorf("expected integer index for list, got '%s' in path '%s'", part, keyPath)
+		}
+		if idx < 0 || idx >= len(current.Content) {
+			return nil, fmt.Errorf("index %d out of range in path '%s'", idx, keyPath)
+		}
+		return current.Content[idx], nil
+	default:
+		if !last {
+			return nil, fmt.Errorf("cannot traverse into scalar at '%s' in path '%s'", part, keyPath)
+		}
+		return current, nil
+	}
+}
+
+// lookup finds key in mapping. The first search scans the entries; a repeat
+// search of the same mapping builds and then uses an index.
+func (r *keyResolver) lookup(mapping *yaml.Node, key string) (*yaml.Node, bool) {
+	index, ok := r.indexes[mapping]
+	if !ok && r.searched[mapping] {
+		index = make(map[string]*yaml.Node, len(mapping.Content)/2)
+		for j := 0; j < len(mapping.Content); j += 2 {
+			k := mapping.Content[j].Value
+			if _, dup := index[k]; !dup {
+				index[k] = mapping.Content[j+1]
 			}
 		}
+		r.indexes[mapping] = index
+		ok = true
+	}
+	if ok {
+		child, found := index[key]
+		return child, found
+	}
+
+	if r.searched != nil {
+		r.searched[mapping] = true
+	}
+	for j := 0; j < len(mapping.Content); j += 2 {
+		if mapping.Content[j].Value == key {
+			return mapping.Content[j+1], true
+		}
+	}
+	return nil, false
+}
+
+// pathSegment is one step of a dot-notation path. Paths are linked from child
+// to parent and only joined into a string when a change is actually recorded.
+type pathSegment struct {
+	parent *pathSegment
+	key    string
+}
+
+// join returns the dot-notation path of key beneath p.
+func (p *pathSegment) join(key string) string {
+	n := len(key)
+	for s := p; s != nil; s = s.parent {
+		n += len(s.key) + 1
+	}
+
+	buf := make([]byte, n)
+	i := n - len(key)
+	copy(buf[i:], key)
+	for s := p; s != nil; s = s.parent {
+		i--
+		buf[i] = '.'
+		i -= len(s.key)
+		copy(buf[i:], s.key)
+	}
+	return string(buf)
+}
+
+// nodeFrame is a pending node on a depth-first walk stack.
+type nodeFrame struct {
+	node *yaml.Node
+	path *pathSegment
+}
 
-		// Check for name/newTag pattern (Kustomize-style)
-		if nameNode, ok := keyMap["name"]; ok {
-			if newTagNode, ok := keyMap["newTag"]; ok {
-				nameVal := nameNode.Value
-				if strings.HasSuffix(nameVal, "/"+imageName) || nameVal == imageName {
-					oldTag := nodeValue(newTagNode)
-					coerced := coerceValue(newTag, newTagNode)
-					if newTagNode.Value != coerced {
-						doc.edits = append(doc.edits, valueEdit{
-							Line:     newTagNode.Line,
-							Column:   newTagNode.Column,
-							OldValue: newTagNode.Value,
-							NewValue: coerced,
-							Style:    newTagNode.Style,
-						})
-						tagPath := "newTag"
-						if path != "" {
-							tagPath = path + ".newTag"
-						}
-						*changes = append(*changes, Change{
-							Key: tagPath,
-							Old: oldTag,
-							New: parseValue(coerced),
-						})
-						newTagNode.Value = coerced
-					}
+// walkImageTags updates the tags of images in tags (image name → new tag, matched
+// via matchImage). It visits the tree depth-first with an explicit stack, in the
+// same order as a recursive pre-order walk, so changes are reported in document order.
+func walkImageTags(doc *Document, root *yaml.Node, tags map[string]string, changes *[]Change) {
+	stack := []nodeFrame{{node: root}}
+	for len(stack) > 0 {
+		frame := stack[len(stack)-1]
+		stack = stack[:len(stack)-1]
+		node := frame.node
+
+		switch node.Kind {
+		case yaml.MappingNode:
+			// Pick out the four keys of interest in one pass, without building a
+			// per-node lookup map.
+			var repoNode, tagNode, nameNode, newTagNode *yaml.Node
+			for i := 0; i+1 < len(node.Content); i += 2 {
+				switch node.Content[i].Value {
+				case "repository":
+					repoNode = node.Content[i+1]
+				case "tag":
+					tagNode = node.Content[i+1]
+				case "name":
+					nameNode = node.Content[i+1]
+				case "newTag":
+					newTagNode = node.Content[i+1]
+				}
+			}
+
+			// Check for repository/tag pattern (Helm-style)
+			if repoNode != nil && tagNode != nil {
+				if newTag, ok := matchImage(repoNode.Value, tags); ok {
+					setScalar(doc, tagNode, newTag, frame.path, "tag", changes)
+				}
+			}
+
+			// Check for name/newTag pattern (Kustomize-style)
+			if nameNode != nil && newTagNode != nil {
+				if newTag, ok := matchImage(nameNode.Value, tags); ok {
+					setScalar(doc, newTagNode, newTag, frame.path, "newTag", changes)
 				}
 			}
-		}
 
-		// Recurse into children
-		for i := 0; i < len(node.Content); i += 2 {
-			key := node.Content[i].Value
-			childPath := key
-			if path != "" {
-				childPath = path + "." + key
+			// Push children in reverse so they are popped in document order.
+			// Scalars can never match, so they are not pushed at all.
+			for i := len(node.Content) - 2; i >= 0; i -= 2 {
+				child := node.Content[i+1]
+				if child.Kind == yaml.MappingNode || child.Kind == yaml.SequenceNode {
+					stack = append(stack, nodeFrame{
+						node: child,
+						path: &pathSegment{parent: frame.path, key: node.Content[i].Value},
+					})
+				}
+			}
+		case yaml.SequenceNode:
+			for i := len(node.Content) - 1; i >= 0; i-- {
+				child := node.Content[i]
+				if child.Kind == yaml.MappingNode || child.Kind == yaml.SequenceNode {
+					stack = append(stack, nodeFrame{
+						node: child,
+						path: &pathSegment{parent: frame.path, key: strconv.Itoa(i)},
+					})
+				}
 			}
-			walkImageTags(doc, node.Content[i+1], imageName, newTag, changes, childPath)
 		}
-	case yaml.SequenceNode:
-		for i, child := range node.Content {
-			childPath := fmt.Sprintf("%s.%d", path, i)
-			if path == "" {
-				childPath = strconv.Itoa(i)
+	}
+}
+
+// matchImage returns the new tag for image reference ref: an exact name match
+// first, then the longest "/"-delimited suffix of ref found in tags.
+func matchImage(ref string, tags map[string]string) (string, bool) {
+	if tag, ok := tags[ref]; ok {
+		return tag, true
+	}
+	for i := 0; i < len(ref); i++ {
+		if ref[i] == '/' {
+			if tag, ok := tags[ref[i+1:]]; ok {
+				return tag, true
 			}
-			walkImageTags(doc, child, imageName, newTag, changes, childPath)
 		}
 	}
+	return "", false
+}
+
+// setScalar updates node to newValue and records the change under path.key.
+func setScalar(doc *Document, node *yaml.Node, newValue string, path *pathSegment, key string, changes *[]Change) {
+	oldValue := nodeValue(node)
+	coerced, _ := coerceValue(newValue, node)
+	if node.Value == coerced {
+		return
+	}
+
+	doc.edits = append(doc.edits, valueEdit{
+		Line:     node.Line,
+		Column:   node.Column,
+		OldValue: node.Value,
+		NewValue: coerced,
+		Style:    node.Style,
+	})
+	*changes = append(*changes, Change{
+		Key: path.join(key),
+		Old: oldValue,
+		New: parseValue(coerced),
+	})
+	node.Value = coerced
 }
 
 func nodeValue(node *yaml.Node) any {
@@ -406,11 +631,15 @@ func nodeValue(node *yaml.Node) any {
 }
 
 func parseValue(s string) any {
-	if v, err := strconv.Atoi(s); err == nil {
-		return v
-	}
-	if v, err := strconv.ParseFloat(s, 64); err == nil {
-		return v
+	// Most new values are tags or plain strings ("v1.2.3", "latest"); skip the
+	// numeric parsers, and the errors they allocate, when s cannot be a number.
+	if mayBeNumber(s) {
+		if v, err := strconv.Atoi(s); err == nil {
+			return v
+		}
+		if v, err := strconv.ParseFloat(s, 64); err == nil {
+			return v
+		}
 	}
 	if s == "true" {
 		return true
@@ -421,79 +650,115 @@ func parseValue(s string) any {
 	return s
 }
 
-func coerceValue(newValue string, node *yaml.Node) string {
+// mayBeNumber reports whether s starts with a byte that strconv.Atoi or
+// strconv.ParseFloat could accept: a digit, sign, dot, or the start of
+// "inf"/"infinity"/"nan".
+func mayBeNumber(s string) bool {
+	if s == "" {
+		return false
+	}
+	switch c := s[0]; {
+	case c >= '0' && c <= '9', c == '+', c == '-', c == '.':
+		return true
+	case c == 'i', c == 'I', c == 'n', c == 'N':
+		return true
+	}
+	return false
+}
+
+// coerceValue converts newValue to match the type of node's current value,
+// dispatching once on the node's tag. typed reports whether the result is
+// valid for that tag; values that don't fit are returned unchanged.
+func coerceValue(newValue string, node *yaml.Node) (coerced string, typed bool) {
 	switch node.Tag {
 	case "!!int":
-		if _, err := strconv.Atoi(newValue); err == nil {
-			return newValue
-		}
+		_, err := strconv.Atoi(newValue)
+		return newValue, err == nil
 	case "!!float":
-		if _, err := strconv.ParseFloat(newValue, 64); err == nil {
-			return newValue
-		}
+		_, err := strconv.ParseFloat(newValue, 64)
+		return newValue, err == nil
 	case "!!bool":
-		lower := strings.ToLower(strings.TrimSpace(newValue))
-		if lower == "true" || lower == "yes" || lower == "1" {
-			return "true"
+		v := strings.TrimSpace(newValue)
+		if strings.EqualFold(v, "true") || strings.EqualFold(v, "yes") || v == "1" {
+			return "true", true
 		}
-		return "false"
+		return "false", true
+	}
+	return newValue, true
+}
+
+// StructuralDiff summarises changes as one "~ key: old → new" line per change,
+// without comparing file contents.
+func StructuralDiff(filename string, changes []Change) string {
+	if len(changes) == 0 {
+		return ""
+	}
+
+	var b strings.Builder
+	fmt.Fprintf(&b, "--- %s", filename)
+	for _, c := range changes {
+		fmt.Fprintf(&b, "\n~ %s: %v → %v", c.Key, c.Old, c.New)
 	}
-	return newValue
+	return b.String()
 }
 
 // Diff generates a simple unified diff between original and new content.
+// Lines are compared in place as byte slices; only lines that differ are
+// copied into the output, so unchanged regions cost no allocations.
 func Diff(filename string, original, updated []byte) string {
-	if string(original) == string(updated) {
+	if bytes.Equal(original, updated) {
 		return ""
 	}
 
-	origLines := strings.Split(string(original), "\n")
-	newLines := strings.Split(string(updated), "\n")
+	// Updates are usually a few lines in a large file: skip the shared head
+	// and tail with bulk byte comparisons and only scan the changed window.
+	origWindow, newWindow, firstLine := changedWindow(original, updated)
 
-	var lines []string
-	lines = append(lines, fmt.Sprintf("--- %s", filename))
-	lines = append(lines, fmt.Sprintf("+++ %s", filename))
-
-	maxLen := len(origLines)
-	if len(newLines) > maxLen {
-		maxLen = len(newLines)
-	}
+	// The output is roughly the changed windows of both files plus headers,
+	// so size the builder up front instead of growing it line by line.
+	var b strings.Builder
+	b.Grow(2*len(filename) + len(origWindow) + len(newWindow) + 64)
+	fmt.Fprintf(&b, "--- %s\n+++ %s", filename, filename)
 
-	var hunkOrig, hunkNew []string
+	var hunkOrig, hunkNew [][]byte
 	hunkStart := -1
 
 	flushHunk := func() {
 		if len(hunkOrig) > 0 || len(hunkNew) > 0 {
-			lines = append(lines, fmt.Sprintf("@@ -%d,%d +%d,%d @@", hunkStart+1, len(hunkOrig), hunkStart+1, len(hunkNew)))
+			fmt.Fprintf(&b, "\n@@ -%d,%d +%d,%d @@", hunkStart+1, len(hunkOrig), hunkStart+1, len(hunkNew))
 			for _, line := range hunkOrig {
-				lines = append(lines, "-"+line)
+				b.WriteString("\n-")
+				b.Write(line)
 			}
 			for _, line := range hunkNew {
-				lines = append(lines, "+"+line)
+				b.WriteString("\n+")
+				b.Write(line)
 			}
 		}
-		hunkOrig = nil
-		hunkNew = nil
+		hunkOrig = hunkOrig[:0]
+		hunkNew = hunkNew[:0]
 		hunkStart = -1
 	}
 
-	for i := 0; i < maxLen; i++ {
-		var orig, curr string
-		if i < len(origLines) {
-			orig = origLines[i]
-		}
-		if i < len(newLines) {
-			curr = newLines[i]
+	origLines := lineScanner{data: origWindow}
+	newLines := lineScanner{data: newWindow}
+	for i := firstLine; ; i++ {
+		orig, hasOrig := origLines.next()
+		curr, hasNew := newLines.next()
+		if !hasOrig && !hasNew {
+			break
 		}
 
-		if orig != curr {
+		// A missing line compares as empty, matching the positional comparison
+		// of the two files' lines.
+		if !bytes.Equal(orig, curr) {
 			if hunkStart == -1 {
 				hunkStart = i
 			}
-			if i < len(origLines) {
+			if hasOrig {
 				hunkOrig = append(hunkOrig, orig)
 			}
-			if i < len(newLines) {
+			if hasNew {
 				hunkNew = append(hunkNew, curr)
 			}
 		} else {
@@ -502,5 +767,62 @@ func Diff(filename string, original, updated []byte) string {
 	}
 	flushHunk()
 
-	return strings.Join(lines, "\n")
+	return b.String()
+}
+
+// changedWindow trims the lines shared at the start of a and b, and, when both
+// have the same number of lines, the lines shared at the end. It returns the
+// remaining windows and the 0-based line number at which they start.
+func changedWindow(a, b []byte) (aWindow, bWindow []byte, firstLine int) {
+	n := min(len(a), len(b))
+
+	// Compare in blocks first; bytes.Equal is vectorized.
+	const block = 256
+	prefix := 0
+	for prefix+block <= n && bytes.Equal(a[prefix:prefix+block], b[prefix:prefix+block]) {
+		prefix += block
+	}
+	for prefix < n && a[prefix] == b[prefix] {
+		prefix++
+	}
+	start := bytes.LastIndexByte(a[:prefix], '\n') + 1
+	firstLine = bytes.Count(a[:start], []byte{'\n'})
+
+	aEnd, bEnd := len(a), len(b)
+	// Lines are compared by position, so trailing lines only line up when
+	// both sides have the same number of lines.
+	if bytes.Count(a[start:], []byte{'\n'}) == bytes.Count(b[start:], []byte{'\n'}) {
+		suffix := 0
+		for suffix < n-start && a[len(a)-1-suffix] == b[len(b)-1-suffix] {
+			suffix++
+		}
+		// Only drop whole lines: move the cut to just after a newline.
+		if i := bytes.IndexByte(a[len(a)-suffix:], '\n'); suffix > 0 && i >= 0 {
+			cut := suffix - i - 1
+			aEnd, bEnd = len(a)-cut, len(b)-cut
+		}
+	}
+
+	return a[start:aEnd], b[start:bEnd], firstLine
+}
+
+// lineScanner yields the "\n"-separated lines of data without copying them,
+// including a final empty line after a trailing newline.
+type lineScanner struct {
+	data []byte
+	pos  int
+	done bool
+}
+
+func (s *lineScanner) next() ([]byte, bool) {
+	if s.done {
+		return nil, false
+	}
+	if i := bytes.IndexByte(s.data[s.pos:], '\n'); i >= 0 {
+		line := s.data[s.pos : s.pos+i]
+		s.pos += i + 1
+		return line, true
+	}
+	s.done = true
+	return s.data[s.pos:], true
 }
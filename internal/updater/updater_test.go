@@ -1,10 +1,13 @@
 package updater
 
 import (
+	"math"
 	"os"
 	"path/filepath"
 	"strings"
 	"testing"
+
+	"gopkg.in/yaml.v3"
 )
 
 func TestUpdateKeys(t *testing.T) {
@@ -58,6 +61,13 @@ func TestUpdateKeys(t *testing.T) {
 			values:  []string{"val"},
 			wantErr: true,
 		},
+		{
+			name:    "missing key after repeated lookups in same mapping",
+			yaml:    "x: 1\ny: 2\nz: 3\n",
+			keys:    []string{"x", "y", "missing"},
+			values:  []string{"10", "20", "30"},
+			wantErr: true,
+		},
 		{
 			name:    "invalid list index",
 			yaml:    "items:\n  - a\n",
@@ -86,6 +96,43 @@ func TestUpdateKeys(t *testing.T) {
 	}
 }
 
+func TestUpdateKeysSharedPrefixes(t *testing.T) {
+	yaml := `app:
+  image:
+    repository: ghcr.io/org/app
+    tag: v1
+  sidecars:
+    - name: a
+      tag: v1
+    - name: b
+      tag: v1
+`
+	doc, err := LoadYAML([]byte(yaml))
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	keys := []string{"app.image.tag", "app.image.repository", "app.sidecars.0.tag", "app.sidecars.1.tag"}
+	values := []string{"v2", "ghcr.io/org/new", "v3", "v4"}
+	changes, err := UpdateKeys(doc, keys, values)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(changes) != len(keys) {
+		t.Fatalf("expected %d changes, got %d", len(keys), len(changes))
+	}
+	for i, c := range changes {
+		if c.Key != keys[i] || c.New != values[i] {
+			t.Errorf("change %d = %s -> %v, want %s -> %s", i, c.Key, c.New, keys[i], values[i])
+		}
+	}
+
+	_, err = UpdateKeys(doc, []string{"app.image.tag", "app.image.missing"}, []string{"v2", "x"})
+	if err == nil || err.Error() != "key 'missing' not found in path 'app.image.missing'" {
+		t.Errorf("unexpected error for missing key under cached prefix: %v", err)
+	}
+}
+
 func TestTypeCoercion(t *testing.T) {
 	tests := []struct {
 		name     string
@@ -144,6 +191,59 @@ func TestTypeCoercion(t *testing.T) {
 	}
 }
 
+func TestCoerceValue(t *testing.T) {
+	tests := []struct {
+		tag       string
+		value     string
+		want      string
+		wantTyped bool
+	}{
+		{tag: "!!int", value: "5", want: "5", wantTyped: true},
+		{tag: "!!int", value: "abc", want: "abc", wantTyped: false},
+		{tag: "!!float", value: "1.5", want: "1.5", wantTyped: true},
+		{tag: "!!float", value: "x", want: "x", wantTyped: false},
+		{tag: "!!bool", value: " Yes ", want: "true", wantTyped: true},
+		{tag: "!!bool", value: "TRUE", want: "true", wantTyped: true},
+		{tag: "!!bool", value: "1", want: "true", wantTyped: true},
+		{tag: "!!bool", value: "nope", want: "false", wantTyped: true},
+		{tag: "!!str", value: "42", want: "42", wantTyped: true},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.tag+"/"+tt.value, func(t *testing.T) {
+			got, typed := coerceValue(tt.value, &yaml.Node{Tag: tt.tag})
+			if got != tt.want || typed != tt.wantTyped {
+				t.Errorf("coerceValue(%q) = (%q, %v), want (%q, %v)", tt.value, got, typed, tt.want, tt.wantTyped)
+			}
+		})
+	}
+}
+
+func TestParseValue(t *testing.T) {
+	tests := []struct {
+		in   string
+		want any
+	}{
+		{"42", 42},
+		{"-3", -3},
+		{"1.5", 1.5},
+		{".5", 0.5},
+		{"Inf", math.Inf(1)},
+		{"true", true},
+		{"false", false},
+		{"v1.2.3", "v1.2.3"},
+		{"latest", "latest"},
+		{"nightly", "nightly"},
+		{"", ""},
+	}
+
+	for _, tt := range tests {
+		if got := parseValue(tt.in); got != tt.want {
+			t.Errorf("parseValue(%q) = %#v, want %#v", tt.in, got, tt.want)
+		}
+	}
+}
+
 func TestUpdateImageTags(t *testing.T) {
 	tests := []struct {
 		name      string
@@ -347,6 +447,41 @@ func TestDiff(t *testing.T) {
 		}
 	})
 
+	t.Run("exact format", func(t *testing.T) {
+		original := "a: 1\nb: 2\nc: 3\nd: 4\n"
+		updated := "a: 1\nb: 20\nc: 3\nd: 40\n"
+
+		want := "--- f.yaml\n+++ f.yaml\n" +
+			"@@ -2,1 +2,1 @@\n-b: 2\n+b: 20\n" +
+			"@@ -4,1 +4,1 @@\n-d: 4\n+d: 40"
+		if got := Diff("f.yaml", []byte(original), []byte(updated)); got != want {
+			t.Errorf("unexpected diff:\ngot:\n%s\nwant:\n%s", got, want)
+		}
+	})
+
+	t.Run("different line counts", func(t *testing.T) {
+		original := "a: 1\nb: 2\n"
+		updated := "a: 1\nb: 3\nc: 4\n"
+
+		want := "--- f.yaml\n+++ f.yaml\n" +
+			"@@ -2,2 +2,2 @@\n-b: 2\n-\n+b: 3\n+c: 4"
+		if got := Diff("f.yaml", []byte(original), []byte(updated)); got != want {
+			t.Errorf("unexpected diff:\ngot:\n%s\nwant:\n%s", got, want)
+		}
+	})
+
+	t.Run("change inside large unchanged file", func(t *testing.T) {
+		head := strings.Repeat("pad: x\n", 500)
+		tail := strings.Repeat("pad: y\n", 500)
+		original := head + "tag: v1\n" + tail
+		updated := head + "tag: v2\n" + tail
+
+		want := "--- f.yaml\n+++ f.yaml\n@@ -501,1 +501,1 @@\n-tag: v1\n+tag: v2"
+		if got := Diff("f.yaml", []byte(original), []byte(updated)); got != want {
+			t.Errorf("unexpected diff:\ngot:\n%s\nwant:\n%s", got, want)
+		}
+	})
+
 	t.Run("empty when no changes", func(t *testing.T) {
 		content := "app:\n  version: v1.0.0\n"
 		diff := Diff("test.yaml", []byte(content), []byte(content))
@@ -357,6 +492,23 @@ func TestDiff(t *testing.T) {
 	})
 }
 
+func TestStructuralDiff(t *testing.T) {
+	changes := []Change{
+		{Key: "app.version", Old: "v1.0.0", New: "v2.0.0"},
+		{Key: "app.replicas", Old: 1, New: 3},
+	}
+
+	got := StructuralDiff("values.yaml", changes)
+	want := "--- values.yaml\n~ app.version: v1.0.0 → v2.0.0\n~ app.replicas: 1 → 3"
+	if got != want {
+		t.Errorf("unexpected diff:\ngot:\n%s\nwant:\n%s", got, want)
+	}
+
+	if got := StructuralDiff("values.yaml", nil); got != "" {
+		t.Errorf("expected empty diff for no changes, got %q", got)
+	}
+}
+
 func TestMultipleImageMatches(t *testing.T) {
 	yaml := `services:
   api:
@@ -377,7 +529,86 @@ initContainers:
 	changes := UpdateImageTags(doc, "api", "v5.0.0")
 
 	if len(changes) != 2 {
-		t.Errorf("expected 2 changes, got %d", len(changes))
+		t.Fatalf("expected 2 changes, got %d", len(changes))
+	}
+
+	wantKeys := []string{"services.api.image.tag", "initContainers.0.image.tag"}
+	for i, want := range wantKeys {
+		if changes[i].Key != want {
+			t.Errorf("change %d key = %q, want %q", i, changes[i].Key, want)
+		}
+	}
+}
+
+func TestUpdateImageTagsBatch(t *testing.T) {
+	yaml := `api:
+  image:
+    repository: ghcr.io/myorg/api
+    tag: v1.0.0
+web:
+  image:
+    repository: ghcr.io/myorg/web
+    tag: v1.0.0
+images:
+  - name: ghcr.io/myorg/web
+    newTag: v1.0.0
+  - name: ghcr.io/other/worker
+    newTag: v1.0.0
+`
+	doc, _ := LoadYAML([]byte(yaml))
+	changes := UpdateImageTagsBatch(doc, map[string]string{
+		"api":          "v2.0.0",
+		"myorg/web":    "v3.0.0",
+		"other/worker": "v1.0.0",
+	})
+
+	want := map[string]any{
+		"api.image.tag":   "v2.0.0",
+		"web.image.tag":   "v3.0.0",
+		"images.0.newTag": "v3.0.0",
+	}
+	if len(changes) != len(want) {
+		t.Fatalf("expected %d changes, got %d: %+v", len(want), len(changes), changes)
+	}
+	for _, c := range changes {
+		if want[c.Key] != c.New {
+			t.Errorf("change %s -> %v, want %v", c.Key, c.New, want[c.Key])
+		}
+	}
+}
+
+func TestUpdateImageTagsNameNotInSource(t *testing.T) {
+	tests := []struct {
+		name      string
+		yaml      string
+		imageName string
+		want      int
+	}{
+		{
+			name:      "name absent",
+			yaml:      "image:\n  repository: ghcr.io/myorg/webapp\n  tag: v1.0.0\n",
+			imageName: "worker",
+			want:      0,
+		},
+		{
+			name:      "name only reachable through an escape",
+			yaml:      "image:\n  repository: \"ghcr.io/myorg/web\\x61pp\"\n  tag: v1.0.0\n",
+			imageName: "webapp",
+			want:      1,
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			doc, err := LoadYAML([]byte(tt.yaml))
+			if err != nil {
+				t.Fatalf("LoadYAML error: %v", err)
+			}
+			changes := UpdateImageTags(doc, tt.imageName, "v2.0.0")
+			if len(changes) != tt.want {
+				t.Errorf("UpdateImageTags got %d changes, want %d", len(changes), tt.want)
+			}
+		})
 	}
 }
 
@@ -506,7 +737,55 @@ api:
 	}
 }
 
-func TestHasMarker(t *testing.T) {
+func TestUpdateByMarkerSameValueTwice(t *testing.T) {
+	// The base marker and a suffixed marker both match the same value; the
+	// last update must win in the rendered output.
+	yaml := "api:\n  image_tag: v1.0.0 # x-yaml-update:api\n  other: v1.0.0 # x-yaml-update:other\n"
+	doc, err := LoadYAML([]byte(yaml))
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	UpdateByMarker(doc, "x-yaml-update", "v2.0.0")
+	UpdateByMarker(doc, "x-yaml-update:api", "v3.0.0")
+
+	result, err := DumpYAML(doc)
+	if err != nil {
+		t.Fatal(err)
+	}
+	want := "api:\n  image_tag: v3.0.0 # x-yaml-update:api\n  other: v2.0.0 # x-yaml-update:other\n"
+	if string(result) != want {
+		t.Errorf("unexpected output:\ngot:\n%s\nwant:\n%s", result, want)
+	}
+}
+
+func TestUpdateByMarkerKeysInDocumentOrder(t *testing.T) {
+	yaml := `first: v1 # x-yaml-update
+nested:
+  jobs:
+    - tag: v1 # x-yaml-update
+    - name: worker
+      tag: v1 # x-yaml-update
+last: v1 # x-yaml-update
+`
+	doc, err := LoadYAML([]byte(yaml))
+	if err != nil {
+		t.Fatal(err)
+	}
+
+	changes := UpdateByMarker(doc, "x-yaml-update", "v2")
+	want := []string{"first", "nested.jobs.0.tag", "nested.jobs.1.tag", "last"}
+	if len(changes) != len(want) {
+		t.Fatalf("got %d changes, want %d", len(changes), len(want))
+	}
+	for i, key := range want {
+		if changes[i].Key != key {
+			t.Errorf("change %d: got key %q, want %q", i, changes[i].Key, key)
+		}
+	}
+}
+
+func TestMatchMarker(t *testing.T) {
 	tests := []struct {
 		comment string
 		marker  string
@@ -529,9 +808,57 @@ func TestHasMarker(t *testing.T) {
 
 	for _, tt := range tests {
 		t.Run(tt.comment, func(t *testing.T) {
-			got := hasMarker(tt.comment, tt.marker)
+			got := matchMarker(tt.comment, tt.marker, tt.marker+":")
 			if got != tt.want {
-				t.Errorf("hasMarker(%q, %q) = %v, want %v", tt.comment, tt.marker, got, tt.want)
+				t.Errorf("matchMarker(%q, %q) = %v, want %v", tt.comment, tt.marker, got, tt.want)
+			}
+		})
+	}
+}
+
+func TestDetectIndent(t *testing.T) {
+	tests := []struct {
+		name    string
+		content string
+		want    int
+	}{
+		{name: "two spaces", content: "a:\n  b: 1\n", want: 2},
+		{name: "four spaces", content: "a:\n    b: 1\n", want: 4},
+		{name: "skips comments and blanks", content: "# top\n\na:\n      # note\n\n   b: 1\n", want: 3},
+		{name: "no trailing newline", content: "a:\n    b: 1", want: 4},
+		{name: "flat file defaults to two", content: "a: 1\nb: 2\n", want: 2},
+		{name: "empty defaults to two", content: "", want: 2},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := detectIndent([]byte(tt.content)); got != tt.want {
+				t.Errorf("detectIndent() = %d, want %d", got, tt.want)
+			}
+		})
+	}
+}
+
+func TestDocumentEmpty(t *testing.T) {
+	tests := []struct {
+		name string
+		yaml string
+		want bool
+	}{
+		{"zero bytes", "", true},
+		{"whitespace only", "\n  \n", true},
+		{"comment only", "# nothing here\n", true},
+		{"mapping", "app:\n  version: v1.0.0\n", false},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			doc, err := LoadYAML([]byte(tt.yaml))
+			if err != nil {
+				t.Fatalf("LoadYAML error: %v", err)
+			}
+			if got := doc.Empty(); got != tt.want {
+				t.Errorf("Empty() = %v, want %v", got, tt.want)
 			}
 		})
 	}